@@ -15,16 +15,17 @@ CMD_LOAD_DATA = 0x1D
 ACK_FINISH    = 0xF1
 ECALL_OPCODE  = b'\x73\x00\x00\x00'
 
+COLORS = {
+    "green": "\033[92m",
+    "red": "\033[91m",
+    "yellow": "\033[93m",
+    "cyan": "\033[96m",
+    "white": "\033[0m"
+}
+COLOR_RESET = COLORS["white"]
+
 def print_status(msg, color="white"):
-    colors = {
-        "green": "\033[92m",
-        "red": "\033[91m",
-        "yellow": "\033[93m",
-        "cyan": "\033[96m",
-        "white": "\033[0m"
-    }
-    end = colors["white"]
-    print(f"{colors.get(color, end)}{msg}{end}")
+    print(f"{COLORS.get(color, COLOR_RESET)}{msg}{COLOR_RESET}")
 
 def validate_binary(data):
     """Checks if data is aligned and ends with ECALL"""
@@ -1,7 +1,10 @@
 import sys
-import struct
 import re
 import argparse
+from functools import lru_cache
+from collections import namedtuple, OrderedDict
+import hashlib
+from array import array
 import logging
 
 raw_log = logging.getLogger('riscv.raw')
@@ -10,25 +13,39 @@ clean_log = logging.getLogger('riscv.clean')
 # ==============================================================================
 # 1. DEBUG LOGGING UTILITY
 # ==============================================================================
+# Encoded words per Raw tab record
+RAW_LOG_BATCH = 256
+
 class Log:
     """Boilerplate redirected to the logging system."""
+
+    # Per-instruction tracing; errors are always reported
+    enabled = True
     
     @staticmethod
-    def step(pc, msg):
+    def step(pc, msg, *args):
+        if not Log.enabled or not clean_log.isEnabledFor(logging.INFO): return
         # Human readable status goes to Clean tab
-        clean_log.info(f"0x{pc:03X} | {msg}")
+        clean_log.info("0x%03X | " + msg, pc, *args)
 
     @staticmethod
     def macro(old, new_list):
-        clean_log.info(f"  ↳ Macro: '{old}' -> {', '.join(new_list)}")
+        if not Log.enabled or not clean_log.isEnabledFor(logging.INFO): return
+        clean_log.info("  ↳ Macro: '%s' -> %s", old, ', '.join(new_list))
 
     @staticmethod
     def encode(val):
-        # The Raw hex value goes to the Raw tab
-        raw_log.info(f"0x{val:08x}")
         # Detailed encoding info goes to the Clean tab
-        le_bytes = " ".join(f"{b:02x}" for b in struct.pack('<I', val))
-        clean_log.info(f"    ✓ Encoded: 0x{val:08x} | Bytes: [{le_bytes}]")
+        if Log.enabled and clean_log.isEnabledFor(logging.INFO):
+            le_bytes = val.to_bytes(4, 'little').hex(' ')
+            clean_log.info("    ✓ Encoded: 0x%08x | Bytes: [%s]", val, le_bytes)
+
+    @staticmethod
+    def words(values):
+        if not Log.enabled or not raw_log.isEnabledFor(logging.INFO): return
+        # The Raw hex values go to the Raw tab in program order, one record per batch of words
+        for i in range(0, len(values), RAW_LOG_BATCH):
+            raw_log.info("\n".join(map("0x{:08x}".format, values[i:i + RAW_LOG_BATCH])))
 
     @staticmethod
     def error(msg):
@@ -49,47 +66,67 @@ for i in range(32): REGISTERS[f'x{i}'] = i
 
 ASM_TEMP_REG = 't6'
 
+# Operand separators and memory-operand parentheses, prepared once for every line
+_SPLIT_RE = re.compile(r'[,\s]+')
+_PAREN_TRANS = str.maketrans('()', '  ')
+
+# Instruction formats as small ints: the encoder branches on these for every instruction
+FMT_R, FMT_I, FMT_I_SHIFT, FMT_I_LOAD, FMT_S, FMT_B, FMT_U, FMT_J, FMT_SYS = range(9)
+
+InstrSpec = namedtuple('InstrSpec', 'type opcode funct3 funct7 funct12', defaults=(0x0, 0x00, 0x000))
+
 INSTRUCTIONS = {
-    'add':  {'type': 'R', 'opcode': 0x33, 'funct3': 0x0, 'funct7': 0x00},
-    'sub':  {'type': 'R', 'opcode': 0x33, 'funct3': 0x0, 'funct7': 0x20},
-    'sll':  {'type': 'R', 'opcode': 0x33, 'funct3': 0x1, 'funct7': 0x00},
-    'slt':  {'type': 'R', 'opcode': 0x33, 'funct3': 0x2, 'funct7': 0x00},
-    'sltu': {'type': 'R', 'opcode': 0x33, 'funct3': 0x3, 'funct7': 0x00},
-    'xor':  {'type': 'R', 'opcode': 0x33, 'funct3': 0x4, 'funct7': 0x00},
-    'srl':  {'type': 'R', 'opcode': 0x33, 'funct3': 0x5, 'funct7': 0x00},
-    'sra':  {'type': 'R', 'opcode': 0x33, 'funct3': 0x5, 'funct7': 0x20},
-    'or':   {'type': 'R', 'opcode': 0x33, 'funct3': 0x6, 'funct7': 0x00},
-    'and':  {'type': 'R', 'opcode': 0x33, 'funct3': 0x7, 'funct7': 0x00},
-    'addi': {'type': 'I', 'opcode': 0x13, 'funct3': 0x0},
-    'slti': {'type': 'I', 'opcode': 0x13, 'funct3': 0x2},
-    'sltiu':{'type': 'I', 'opcode': 0x13, 'funct3': 0x3},
-    'xori': {'type': 'I', 'opcode': 0x13, 'funct3': 0x4},
-    'ori':  {'type': 'I', 'opcode': 0x13, 'funct3': 0x6},
-    'andi': {'type': 'I', 'opcode': 0x13, 'funct3': 0x7},
-    'slli': {'type': 'I_SHIFT', 'opcode': 0x13, 'funct3': 0x1, 'funct7': 0x00},
-    'srli': {'type': 'I_SHIFT', 'opcode': 0x13, 'funct3': 0x5, 'funct7': 0x00},
-    'srai': {'type': 'I_SHIFT', 'opcode': 0x13, 'funct3': 0x5, 'funct7': 0x20},
-    'lb':   {'type': 'I_LOAD', 'opcode': 0x03, 'funct3': 0x0},
-    'lh':   {'type': 'I_LOAD', 'opcode': 0x03, 'funct3': 0x1},
-    'lw':   {'type': 'I_LOAD', 'opcode': 0x03, 'funct3': 0x2},
-    'lbu':  {'type': 'I_LOAD', 'opcode': 0x03, 'funct3': 0x4},
-    'lhu':  {'type': 'I_LOAD', 'opcode': 0x03, 'funct3': 0x5},
-    'jalr': {'type': 'I_LOAD', 'opcode': 0x67, 'funct3': 0x0},
-    'sb':   {'type': 'S', 'opcode': 0x23, 'funct3': 0x0},
-    'sh':   {'type': 'S', 'opcode': 0x23, 'funct3': 0x1},
-    'sw':   {'type': 'S', 'opcode': 0x23, 'funct3': 0x2},
-    'beq':  {'type': 'B', 'opcode': 0x63, 'funct3': 0x0},
-    'bne':  {'type': 'B', 'opcode': 0x63, 'funct3': 0x1},
-    'lui':  {'type': 'U', 'opcode': 0x37},
-    'jal':  {'type': 'J', 'opcode': 0x6F},
-    'ecall': {'type': 'SYS', 'opcode': 0x73, 'funct3': 0x0, 'funct12': 0x000}
+    'add':  InstrSpec(type=FMT_R, opcode=0x33, funct3=0x0, funct7=0x00),
+    'sub':  InstrSpec(type=FMT_R, opcode=0x33, funct3=0x0, funct7=0x20),
+    'sll':  InstrSpec(type=FMT_R, opcode=0x33, funct3=0x1, funct7=0x00),
+    'slt':  InstrSpec(type=FMT_R, opcode=0x33, funct3=0x2, funct7=0x00),
+    'sltu': InstrSpec(type=FMT_R, opcode=0x33, funct3=0x3, funct7=0x00),
+    'xor':  InstrSpec(type=FMT_R, opcode=0x33, funct3=0x4, funct7=0x00),
+    'srl':  InstrSpec(type=FMT_R, opcode=0x33, funct3=0x5, funct7=0x00),
+    'sra':  InstrSpec(type=FMT_R, opcode=0x33, funct3=0x5, funct7=0x20),
+    'or':   InstrSpec(type=FMT_R, opcode=0x33, funct3=0x6, funct7=0x00),
+    'and':  InstrSpec(type=FMT_R, opcode=0x33, funct3=0x7, funct7=0x00),
+    'addi': InstrSpec(type=FMT_I, opcode=0x13, funct3=0x0),
+    'slti': InstrSpec(type=FMT_I, opcode=0x13, funct3=0x2),
+    'sltiu':InstrSpec(type=FMT_I, opcode=0x13, funct3=0x3),
+    'xori': InstrSpec(type=FMT_I, opcode=0x13, funct3=0x4),
+    'ori':  InstrSpec(type=FMT_I, opcode=0x13, funct3=0x6),
+    'andi': InstrSpec(type=FMT_I, opcode=0x13, funct3=0x7),
+    'slli': InstrSpec(type=FMT_I_SHIFT, opcode=0x13, funct3=0x1, funct7=0x00),
+    'srli': InstrSpec(type=FMT_I_SHIFT, opcode=0x13, funct3=0x5, funct7=0x00),
+    'srai': InstrSpec(type=FMT_I_SHIFT, opcode=0x13, funct3=0x5, funct7=0x20),
+    'lb':   InstrSpec(type=FMT_I_LOAD, opcode=0x03, funct3=0x0),
+    'lh':   InstrSpec(type=FMT_I_LOAD, opcode=0x03, funct3=0x1),
+    'lw':   InstrSpec(type=FMT_I_LOAD, opcode=0x03, funct3=0x2),
+    'lbu':  InstrSpec(type=FMT_I_LOAD, opcode=0x03, funct3=0x4),
+    'lhu':  InstrSpec(type=FMT_I_LOAD, opcode=0x03, funct3=0x5),
+    'jalr': InstrSpec(type=FMT_I_LOAD, opcode=0x67, funct3=0x0),
+    'sb':   InstrSpec(type=FMT_S, opcode=0x23, funct3=0x0),
+    'sh':   InstrSpec(type=FMT_S, opcode=0x23, funct3=0x1),
+    'sw':   InstrSpec(type=FMT_S, opcode=0x23, funct3=0x2),
+    'beq':  InstrSpec(type=FMT_B, opcode=0x63, funct3=0x0),
+    'bne':  InstrSpec(type=FMT_B, opcode=0x63, funct3=0x1),
+    'lui':  InstrSpec(type=FMT_U, opcode=0x37),
+    'jal':  InstrSpec(type=FMT_J, opcode=0x6F),
+    'ecall': InstrSpec(type=FMT_SYS, opcode=0x73, funct3=0x0, funct12=0x000)
+}
+
+# Encoder view of INSTRUCTIONS: (type, opcode/funct3/funct7/funct12 already shifted into place).
+# Fields a format doesn't use are zero, so every encoder just ORs its operands onto the fixed bits.
+_OP_TABLE = {
+    mnemonic: (spec.type, spec.opcode | (spec.funct3 << 12) | (spec.funct7 << 25) | (spec.funct12 << 20))
+    for mnemonic, spec in INSTRUCTIONS.items()
 }
 
 # ==============================================================================
 # 3. HELPER FUNCTIONS
 # ==============================================================================
 
+@lru_cache(maxsize=512)
 def parse_reg(s):
+    # Tokens from _SPLIT_RE are already clean, so the common case is a single dict hit
+    reg = REGISTERS.get(s)
+    if reg is not None: return reg
     s = s.strip().replace(',', '')
     if s in REGISTERS: return REGISTERS[s]
     try:
@@ -97,6 +134,7 @@ def parse_reg(s):
     except: pass
     raise ValueError(f"Unknown register: {s}")
 
+@lru_cache(maxsize=512)
 def parse_imm(s):
     s = s.strip().replace(',', '')
     try: return int(s, 0)
@@ -110,132 +148,215 @@ def signed_int(val, bits):
 # 4. CORE PROCESSING LOGIC
 # ==============================================================================
 
+def join_tokens(parts):
+    """Renders an instruction token tuple back as assembly text ('addi x1, x0, 5')."""
+    return f"{parts[0]} {', '.join(parts[1:])}" if len(parts) > 1 else parts[0]
+
 def expand_macros(raw_lines):
+    """
+    Returns the program as (label, source, tokens) entries with macros already expanded.
+    Label definitions are (label, None, None); instructions are (None, source, tokens),
+    where source is None for macro-generated instructions (see join_tokens).
+    """
     expanded = []
     for line in raw_lines:
         line = line.split('#')[0].strip()
         if not line: continue
-        if line.endswith(':'):
-            expanded.append(line)
-            continue
+        if ':' in line:
+            lbl, line = line.split(':', 1)
+            # Mnemonics and labels are case-insensitive; registers are not
+            expanded.append((sys.intern(lbl.strip().lower()), None, None))
+            line = line.strip()
+            if not line: continue
 
-        parts = re.split(r'[,\s]+', line)
+        # Tokenize once; interned tokens let label lookups and the _encode_pcless cache compare by identity
+        parts = tuple(sys.intern(p) for p in _SPLIT_RE.split(line.translate(_PAREN_TRANS)) if p)
         mnemonic = parts[0].lower()
-        args = [x for x in parts[1:] if x]
+        if mnemonic != parts[0]:
+            parts = (sys.intern(mnemonic),) + parts[1:]
+        args = parts[1:]
         
         new_instrs = []
         if mnemonic == 'nop':
-            new_instrs.append("addi x0, x0, 0")
+            new_instrs.append(('addi', 'x0', 'x0', '0'))
         elif mnemonic == 'mv':
-            new_instrs.append(f"addi {args[0]}, {args[1]}, 0")
+            new_instrs.append(('addi', args[0], args[1], '0'))
         elif mnemonic == 'li':
             rd, imm = args[0], parse_imm(args[1])
             if -2048 <= imm <= 2047:
-                new_instrs.append(f"addi {rd}, zero, {imm}")
+                new_instrs.append(('addi', rd, 'zero', str(imm)))
             else:
                 lower = imm & 0xFFF
                 upper = (imm >> 12) & 0xFFFFF
                 if lower & 0x800: upper += 1
-                new_instrs.append(f"lui {rd}, {upper}")
+                new_instrs.append(('lui', rd, str(upper)))
                 if lower & 0x800: lower -= 4096
-                if lower != 0: new_instrs.append(f"addi {rd}, {rd}, {lower}")
+                if lower != 0: new_instrs.append(('addi', rd, rd, str(lower)))
         elif mnemonic == 'blt':
-            new_instrs.append(f"slt {ASM_TEMP_REG}, {args[0]}, {args[1]}")
-            new_instrs.append(f"bne {ASM_TEMP_REG}, zero, {args[2]}")
+            new_instrs.append(('slt', ASM_TEMP_REG, args[0], args[1]))
+            new_instrs.append(('bne', ASM_TEMP_REG, 'zero', args[2]))
         else:
-            expanded.append(line)
+            expanded.append((None, line, parts))
             continue
 
-        Log.macro(line, new_instrs)
-        expanded.extend(new_instrs)
+        if Log.enabled:
+            Log.macro(line, [join_tokens(instr) for instr in new_instrs])
+        expanded.extend((None, None, instr) for instr in new_instrs)
     return expanded
 
-def assemble(source_lines):
-    """Main internal logic to convert list of strings to binary word list."""
-    clean_log.info("--- Phase 1: Macro Expansion ---")
-    lines = expand_macros(source_lines)
-    
-    labels, pc, clean_instrs = {}, 0, []
-    
-    for line in lines:
-        if line.endswith(':'):
-            labels[line[:-1].lower()] = pc
-            continue
-        if ':' in line:
-            lbl, rest = line.split(':', 1)
-            labels[lbl.strip().lower()] = pc
-            line = rest.strip()
-        clean_instrs.append((pc, line))
-        pc += 4
-
-    clean_log.info("--- Phase 2: Instruction Encoding ---")
-    binary_code = []
-    
-    for pc, line in clean_instrs:
-        Log.step(pc, f"Parsing: {line}")
-        norm_line = line.replace('(', ' ').replace(')', ' ')
-        parts = [p for p in re.split(r'[,\s]+', norm_line) if p]
-        
-        op = parts[0].lower()
-        info = INSTRUCTIONS[op]
-        val = 0
-
-        # --- Encoding Switch ---
-        if info['type'] == 'R':
+def _make_encoder(kind, fixed):
+    """Builds the encoder for one label-free mnemonic, with its fixed bits bound in the closure."""
+    if kind == FMT_R:
+        def encode(parts):
             rd, rs1, rs2 = parse_reg(parts[1]), parse_reg(parts[2]), parse_reg(parts[3])
-            val = (info['funct7'] << 25) | (rs2 << 20) | (rs1 << 15) | (info['funct3'] << 12) | (rd << 7) | info['opcode']
-        elif info['type'] == 'I':
+            return fixed | (rs2 << 20) | (rs1 << 15) | (rd << 7)
+    elif kind == FMT_I:
+        def encode(parts):
             rd, rs1, imm = parse_reg(parts[1]), parse_reg(parts[2]), parse_imm(parts[3])
-            val = (signed_int(imm, 12) << 20) | (rs1 << 15) | (info['funct3'] << 12) | (rd << 7) | info['opcode']
-        elif info['type'] == 'I_SHIFT':
+            return fixed | (signed_int(imm, 12) << 20) | (rs1 << 15) | (rd << 7)
+    elif kind == FMT_I_SHIFT:
+        def encode(parts):
             rd, rs1, shamt = parse_reg(parts[1]), parse_reg(parts[2]), parse_imm(parts[3]) & 0x1F
-            val = (info['funct7'] << 25) | (shamt << 20) | (rs1 << 15) | (info['funct3'] << 12) | (rd << 7) | info['opcode']
-        elif info['type'] == 'I_LOAD':
+            return fixed | (shamt << 20) | (rs1 << 15) | (rd << 7)
+    elif kind == FMT_I_LOAD:
+        def encode(parts):
             rd = parse_reg(parts[1])
             if len(parts) == 4 and not parts[2].isdigit() and parts[3].isdigit():
                 rs1, imm = parse_reg(parts[2]), parse_imm(parts[3])
             else:
                 imm, rs1 = parse_imm(parts[2]), parse_reg(parts[3])
-            val = (signed_int(imm, 12) << 20) | (rs1 << 15) | (info['funct3'] << 12) | (rd << 7) | info['opcode']
-        elif info['type'] == 'S':
+            return fixed | (signed_int(imm, 12) << 20) | (rs1 << 15) | (rd << 7)
+    elif kind == FMT_S:
+        def encode(parts):
             rs2, imm, rs1 = parse_reg(parts[1]), parse_imm(parts[2]), parse_reg(parts[3])
             imm = signed_int(imm, 12)
-            val = (((imm >> 5) & 0x7F) << 25) | (rs2 << 20) | (rs1 << 15) | (info['funct3'] << 12) | ((imm & 0x1F) << 7) | info['opcode']
-        elif info['type'] == 'B':
-            rs1, rs2, offset = parse_reg(parts[1]), parse_reg(parts[2]), signed_int(labels[parts[3].lower()] - pc, 13)
-            val = (((offset >> 12) & 1) << 31) | (((offset >> 5) & 0x3F) << 25) | (rs2 << 20) | (rs1 << 15) | (info['funct3'] << 12) | (((offset >> 1) & 0xF) << 8) | (((offset >> 11) & 1) << 7) | info['opcode']
-        elif info['type'] == 'U':
+            return fixed | (((imm >> 5) & 0x7F) << 25) | (rs2 << 20) | (rs1 << 15) | ((imm & 0x1F) << 7)
+    elif kind == FMT_U:
+        def encode(parts):
             rd, imm = parse_reg(parts[1]), parse_imm(parts[2])
-            val = (imm & 0xFFFFF) << 12 | (rd << 7) | info['opcode']
-        elif info['type'] == 'J':
+            return fixed | (imm & 0xFFFFF) << 12 | (rd << 7)
+    elif kind == FMT_SYS:
+        def encode(parts):
+            return fixed
+    return encode
+
+# One specialised encoder per mnemonic. B/J need the PC and labels and are resolved in assemble()
+ENCODERS = {
+    mnemonic: _make_encoder(kind, fixed)
+    for mnemonic, (kind, fixed) in _OP_TABLE.items() if kind not in (FMT_B, FMT_J)
+}
+
+@lru_cache(maxsize=4096)
+def _encode_pcless(parts):
+    """Encodes an instruction whose operands do not depend on its PC or on labels."""
+    return ENCODERS[parts[0]](parts)
+
+def assemble(source_lines):
+    """Main internal logic to convert list of strings to binary word list."""
+    clean_log.info("--- Phase 1: Macro Expansion ---")
+    lines = expand_macros(source_lines)
+    
+    # Single pass: collect labels and encode as we go. Branches and jumps may target labels
+    # defined further down, so they are queued and patched in once every label is known.
+    clean_log.info("--- Phase 2: Instruction Encoding ---")
+    labels, pc, binary_code, pending = {}, 0, [], []
+
+    for label, source, parts in lines:
+        if label is not None:
+            labels[label] = pc
+            continue
+        Log.step(pc, "Parsing: %s", source or join_tokens(parts))
+
+        kind, fixed = _OP_TABLE[parts[0]]
+        if kind == FMT_B or kind == FMT_J:
+            pending.append((len(binary_code), pc, kind, fixed, parts))
+            binary_code.append(0)
+        else:
+            # No label operand: identical source lines always encode to the same word
+            val = _encode_pcless(parts)
+            Log.encode(val)
+            binary_code.append(val)
+        pc += 4
+
+    clean_log.info("--- Phase 3: Branch/Jump Resolution ---")
+    for index, pc, kind, fixed, parts in pending:
+        Log.step(pc, "Resolving: %s", join_tokens(parts))
+        if kind == FMT_B:
+            rs1, rs2, offset = parse_reg(parts[1]), parse_reg(parts[2]), signed_int(labels[parts[3].lower()] - pc, 13)
+            # Each offset bit group is masked in place and moved straight to its slot: imm[12|10:5] ... imm[4:1|11]
+            val = fixed | ((offset & 0x1000) << 19) | ((offset & 0x7E0) << 20) | (rs2 << 20) | (rs1 << 15) | ((offset & 0x1E) << 7) | ((offset & 0x800) >> 4)
+        else:
             rd, offset = parse_reg(parts[1]), signed_int(labels[parts[2].lower()] - pc, 21)
-            val = (((offset >> 20) & 1) << 31) | (((offset >> 1) & 0x3FF) << 21) | (((offset >> 11) & 1) << 20) | (((offset >> 12) & 0xFF) << 12) | (rd << 7) | info['opcode']
-        elif info['type'] == 'SYS':
-            val = (info['funct12'] << 20) | (info['funct3'] << 12) | info['opcode']
+            # imm[20|10:1|11|19:12]; bits 19:12 already sit at their target position
+            val = fixed | ((offset & 0x100000) << 11) | ((offset & 0x7FE) << 20) | ((offset & 0x800) << 9) | (offset & 0xFF000) | (rd << 7)
 
         Log.encode(val)
-        binary_code.append(val)
+        binary_code[index] = val
+
+    Log.words(binary_code)
     return binary_code
 
 # ==============================================================================
 # 5. STANDARDIZED API
 # ==============================================================================
 
+ASSEMBLY_CACHE_SIZE = 16
+# Most recently assembled sources (keyed by content digest), oldest first
+_ASSEMBLY_CACHE = OrderedDict()
+
+class _TraceRecorder(logging.Handler):
+    """Keeps the records emitted while assembling, so a cache hit can replay the same trace."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
 def assemble_file(input):
     """
     Standard API: Assembles a file and returns the binary data (bytes) 
     or None if an error occurs.
     """
     try:
-        logging.getLogger('riscv.raw').handlers[0].log_element.clear()
-        logging.getLogger('riscv.clean').handlers[0].log_element.clear()
+        # The GUI attaches its log panels as handlers; the CLI runs without them
+        for name in ('riscv.raw', 'riscv.clean'):
+            handlers = logging.getLogger(name).handlers
+            if handlers:
+                handlers[0].log_element.clear()
+
+        # 1. Reuse the previous result when the same source is assembled again, replaying its trace
+        key = hashlib.blake2b(input.encode(), digest_size=16).digest()
+        cached = _ASSEMBLY_CACHE.get(key)
+        if cached is not None:
+            _ASSEMBLY_CACHE.move_to_end(key)
+            payload, machine_code, trace = cached
+            for record in trace:
+                logging.getLogger(record.name).handle(record)
+            return payload, list(machine_code)
+
         lines = input.splitlines()
         
-        # 2. Process assembly logic
-        machine_code = assemble(lines)
+        # 2. Process assembly logic, recording the trace it emits
+        recorder = _TraceRecorder()
+        raw_log.addHandler(recorder)
+        clean_log.addHandler(recorder)
+        try:
+            machine_code = assemble(lines)
+        finally:
+            raw_log.removeHandler(recorder)
+            clean_log.removeHandler(recorder)
+
+        # 3. Pack instructions into a single bytes object (Little Endian) in one C-level copy
+        words = array('I', machine_code)
+        if sys.byteorder == 'big':
+            words.byteswap()
+        payload = words.tobytes()
 
-        # 3. Pack instructions into a single bytes object (Little Endian)
-        payload = b"".join(struct.pack('<I', instr) for instr in machine_code)
+        _ASSEMBLY_CACHE[key] = (payload, tuple(machine_code), tuple(recorder.records))
+        if len(_ASSEMBLY_CACHE) > ASSEMBLY_CACHE_SIZE:
+            _ASSEMBLY_CACHE.popitem(last=False)
 
         return payload, machine_code
 
@@ -251,6 +372,19 @@ if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Simple RISC-V Assembler API")
     parser.add_argument('input', help="Input .s or .asm file")
     parser.add_argument('-o', '--output', default='program.bin', help="Output binary file")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Trace every macro expansion and encoded instruction")
     args = parser.parse_args()
-    
-    assemble_file(args.input, args.output)
+    Log.enabled = args.verbose
+    if args.verbose:
+        # Outside the GUI nothing else prints the raw/clean logs
+        logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    with open(args.input, 'r') as f:
+        result = assemble_file(f.read())
+    if result is None:
+        sys.exit(1)
+
+    # The payload is already the little-endian image: one bulk write
+    payload, _ = result
+    with open(args.output, 'wb') as f:
+        f.write(payload)
@@ -1,36 +1,197 @@
 from backend.schemes import *
 from dataclasses import dataclass, field
 from backend.schemes import AtomicMemTransaction
-@dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping
+
+# 32-bit lane mask for each 4-bit byte strobe (bit i selects byte i)
+_BYTE_LANE_MASKS = tuple(
+    sum(0xFF << (8 * i) for i in range(4) if (strobe >> i) & 1) for strobe in range(16)
+)
+# (bytes kept, bytes inserted) per strobe, so a store is a single AND/AND/OR merge
+_STROBE_MERGE_MASKS = tuple((~lanes & 0xFFFFFFFF, lanes) for lanes in _BYTE_LANE_MASKS)
+
+# Pure integer helper shared by the datapath models (built once, not per call)
+def _to_signed32(n):
+    """Interprets a 32-bit value as signed."""
+    return (n ^ 0x80000000) - 0x80000000
+
+# ALU operations indexed by the 4-bit op code (AluOpCode); results are masked by the caller
+_ALU_OPS = [lambda op1, op2: 0] * 16
+_ALU_OPS[0x0] = lambda op1, op2: op1 + op2                                           # ADD
+_ALU_OPS[0x8] = lambda op1, op2: op1 - op2                                           # SUB
+_ALU_OPS[0x1] = lambda op1, op2: op1 << (op2 & 0x1F)                                 # SLL
+_ALU_OPS[0x5] = lambda op1, op2: op1 >> (op2 & 0x1F)                                 # SRL
+_ALU_OPS[0xD] = lambda op1, op2: _to_signed32(op1) >> (op2 & 0x1F)                   # SRA
+_ALU_OPS[0x2] = lambda op1, op2: int(_to_signed32(op1) < _to_signed32(op2))          # SLT
+_ALU_OPS[0x3] = lambda op1, op2: int(op1 < op2)                                      # SLTU
+_ALU_OPS[0x4] = lambda op1, op2: op1 ^ op2                                           # XOR
+_ALU_OPS[0x6] = lambda op1, op2: op1 | op2                                           # OR
+_ALU_OPS[0x7] = lambda op1, op2: op1 & op2                                           # AND
+_ALU_OPS[0xF] = lambda op1, op2: 0xFFFFFFFF                                          # NOT_USED/DEBUG
+
+def _alu_ctrl_decode(intent, f3, f7_bit30):
+    """ALU control decode: (ALU intent, funct3, instruction bit 30) -> 4-bit ALU op code."""
+    # 4-bit operation codes: the OP_* localparams of alu_controller.sv (archived_vivado_proj)
+    OP_ADD, OP_SUB, OP_SLL, OP_SLT = 0x0, 0x8, 0x1, 0x2
+    OP_SLTU, OP_XOR, OP_SRL, OP_SRA = 0x3, 0x4, 0x5, 0xD
+    OP_OR, OP_AND, OP_NOT_USED = 0x6, 0x7, 0xF
+
+    alu_op = OP_ADD # Default safe
+
+    if intent == 0:   # 00: Load/Store
+        alu_op = OP_ADD
+    elif intent == 1: # 01: Branch
+        alu_op = OP_NOT_USED
+    else:             # 10 (R-Type) or 11 (I-Type)
+        if f3 == 0x0: # ADD/SUB
+            # Only R-Type (10) distinguishes SUB via bit 30
+            alu_op = OP_SUB if (intent == 2 and f7_bit30) else OP_ADD
+        elif f3 == 0x1: alu_op = OP_SLL
+        elif f3 == 0x2: alu_op = OP_SLT
+        elif f3 == 0x3: alu_op = OP_SLTU
+        elif f3 == 0x4: alu_op = OP_XOR
+        elif f3 == 0x5: # SRL/SRA
+            alu_op = OP_SRA if f7_bit30 else OP_SRL
+        elif f3 == 0x6: alu_op = OP_OR
+        elif f3 == 0x7: alu_op = OP_AND
+    return alu_op
+
+# Indexed by (intent << 4) | (funct3 << 1) | bit30
+_ALU_CTRL_LUT = tuple(_alu_ctrl_decode(key >> 4, (key >> 1) & 0x7, key & 1) for key in range(64))
+
+def _wb_forward(pipeline_status, rf_val):
+    # final_rd_data_wb: selects between execution_data_mem and memory_data_mem
+    wb = pipeline_status.mem_wb_status
+    return wb.memory_data_mem if wb.rd_src_mem.value == 1 else wb.execution_data_mem
+
+# Forwarding mux of the RS1/RS2 data selectors: source -> (snapshot, reg file value) -> data
+_RS_SOURCES = {
+    RSn_Source.REG_FILE_AT_ID: lambda pipeline_status, rf_val: rf_val,
+    # Note: We'd need to calculate rd_data_ex if not in status,
+    # but usually available from previous cycle data
+    RSn_Source.RD_DATA_AT_EX: lambda pipeline_status, rf_val: pipeline_status.ex_mem_status.alu_result_ex,
+    # In Verilog: mem_forwarding_data = (rd_src_optn_mem) ? rd_data_mem : alu_result_mem;
+    # Simplified for this snapshot context
+    RSn_Source.RD_DATA_AT_MEM: lambda pipeline_status, rf_val: pipeline_status.ex_mem_status.alu_result_ex,
+    RSn_Source.RD_DATA_AT_WB: _wb_forward,
+}
+
+# Data memory interface, indexed by (funct3 << 2) | address[1:0]
+# Stores: (byte strobe, rs2 data mask, data shift)
+_STORE_LUT = [(0, 0, 0)] * 32
+# Loads: (data shift, width mask, sign bit to extend from)
+_LOAD_LUT = [(0, 0, 0)] * 32
+for _lsb in range(4):
+    _STORE_LUT[(0b000 << 2) | _lsb] = (1 << _lsb, 0xFF, 8 * _lsb)                                  # SB
+    _STORE_LUT[(0b001 << 2) | _lsb] = (0b0011 if _lsb < 2 else 0b1100, 0xFFFF, 16 * (_lsb >> 1))  # SH
+    _STORE_LUT[(0b010 << 2) | _lsb] = (0b1111, 0xFFFFFFFF, 0)                                     # SW
+    _LOAD_LUT[(0b000 << 2) | _lsb] = (8 * _lsb, 0xFF, 0x80)                                       # LB
+    _LOAD_LUT[(0b001 << 2) | _lsb] = (16 * (_lsb >> 1), 0xFFFF, 0x8000)                           # LH
+    _LOAD_LUT[(0b010 << 2) | _lsb] = (0, 0xFFFFFFFF, 0)                                           # LW
+    _LOAD_LUT[(0b100 << 2) | _lsb] = (8 * _lsb, 0xFF, 0)                                          # LBU
+    _LOAD_LUT[(0b101 << 2) | _lsb] = (16 * (_lsb >> 1), 0xFFFF, 0)                                # LHU
+_STORE_LUT, _LOAD_LUT = tuple(_STORE_LUT), tuple(_LOAD_LUT)
+del _lsb
+
+# Immediate extraction per instruction format, sign-extended to a Python int
+def _imm_i(inst_val):
+    # I-Type: imm[11:0] = inst[31:20]
+    imm_11_0 = inst_val >> 20
+    return (imm_11_0 ^ 0x800) - 0x800
+
+def _imm_s(inst_val):
+    # S-Type: imm[11:5] = inst[31:25], imm[4:0] = inst[11:7]
+    raw_imm = ((inst_val >> 20) & 0xFE0) | ((inst_val >> 7) & 0x1F)
+    return (raw_imm ^ 0x800) - 0x800
+
+def _imm_b(inst_val):
+    # B-Type: imm[12|10:5] = inst[31:25], imm[4:1|11] = inst[11:7]
+    raw_imm = (((inst_val >> 19) & 0x1000) | ((inst_val << 4) & 0x800)
+               | ((inst_val >> 20) & 0x7E0) | ((inst_val >> 7) & 0x1E))
+    return (raw_imm ^ 0x1000) - 0x1000
+
+def _imm_u(inst_val):
+    # U-Type: imm[31:12] = inst[31:12]
+    return inst_val & 0xFFFFF000
+
+def _imm_j(inst_val):
+    # J-Type: imm[20|10:1|11|19:12] = inst[31:12]
+    raw_imm = (((inst_val >> 11) & 0x100000) | (inst_val & 0xFF000)
+               | ((inst_val >> 9) & 0x800) | ((inst_val >> 20) & 0x7FE))
+    return (raw_imm ^ 0x100000) - 0x100000
+
+# opcode -> (format name, extractor)
+_IMM_FORMATS = {
+    0x13: ("I-Type", _imm_i), 0x03: ("I-Type", _imm_i), 0x67: ("I-Type", _imm_i),  # Arithmetic, Loads, JALR
+    0x23: ("S-Type", _imm_s),                                                      # Stores
+    0x63: ("B-Type", _imm_b),                                                      # Branches
+    0x37: ("U-Type", _imm_u), 0x17: ("U-Type", _imm_u),                            # LUI, AUIPC
+    0x6F: ("J-Type", _imm_j),                                                      # JAL
+}
+_IMM_UNKNOWN = ("Unknown", lambda inst_val: 0)
+
+# Default Safety State (NOP behavior) of the control unit outputs. Read-only, so every
+# control_inst call can hand out the same mapping instead of building a new dict
+_NOP_CONTROL = MappingProxyType({
+    "is_halt": False, "is_branch": False, "is_jal": False, "is_jalr": False,
+    "mem_write_en": False, "mem_read_en": False, "reg_write_en": False,
+    "rd_src_optn": 0, "alu_intent": 0, "alu_src_optn": 0
+})
+
+# opcode -> control unit outputs, each entry overriding the NOP defaults
+_CONTROL_TABLE = {opcode: MappingProxyType({**_NOP_CONTROL, **signals}) for opcode, signals in {
+    0x33: {"reg_write_en": True, "alu_intent": 2, "rd_src_optn": 0, "alu_src_optn": 0},                       # OP_R_TYPE
+    0x13: {"reg_write_en": True, "alu_intent": 3, "rd_src_optn": 0, "alu_src_optn": 1},                       # OP_I_TYPE
+    0x03: {"reg_write_en": True, "mem_read_en": True, "rd_src_optn": 1, "alu_intent": 0, "alu_src_optn": 1},  # OP_LOAD
+    0x23: {"mem_write_en": True, "alu_intent": 0, "alu_src_optn": 1},                                         # OP_STORE
+    0x63: {"is_branch": True, "alu_intent": 1, "alu_src_optn": 0},                                            # OP_BRANCH
+    0x6F: {"is_jal": True, "reg_write_en": True},                                                             # OP_JAL
+    0x67: {"is_jalr": True, "reg_write_en": True, "alu_intent": 0, "alu_src_optn": 1},                        # OP_JALR
+    0x37: {"reg_write_en": True, "rd_src_optn": 0, "alu_intent": 0, "alu_src_optn": 1},                       # OP_LUI
+    0x17: {"reg_write_en": True, "rd_src_optn": 0, "alu_intent": 0, "alu_src_optn": 1},                       # OP_AUIPC
+    0x73: {"is_halt": True},                                                                                  # OP_SYSTEM
+}.items()}
+
+# Distinct instruction words seen by the decode caches; a program rarely has more
+DECODE_CACHE_SIZE = 1024
+
+@lru_cache(maxsize=DECODE_CACHE_SIZE)
+def _decode_fields(inst_val):
+    """Returns (opcode, rd, funct3, rs1, rs2, funct7) of an instruction word."""
+    return (inst_val & 0x7F, (inst_val >> 7) & 0x1F, (inst_val >> 12) & 0x7,
+            (inst_val >> 15) & 0x1F, (inst_val >> 20) & 0x1F, (inst_val >> 25) & 0x7F)
+
+@lru_cache(maxsize=DECODE_CACHE_SIZE)
+def _decode_immediate(inst_val):
+    """Returns (format name, sign-extended immediate) of an instruction word."""
+    fmt, extract = _IMM_FORMATS.get(inst_val & 0x7F, _IMM_UNKNOWN)
+    return fmt, extract(inst_val)
+
+@dataclass(slots=True)
 class SimulatedDataMemory:
     # Using a dict for sparse memory: {word_address: 32_bit_int}
     # This avoids initializing massive arrays.
     memory: dict[int, int] = field(default_factory=dict)
-    transactions_history: list[AtomicMemTransaction] = field(default_factory=list)
 
     def store_data(self, transaction: AtomicMemTransaction):
         """
         Stores data using a 4-bit byte mask (strobe).
         Matches the hardware 'dmem_byte_mask_o'.
         """
-        if transaction.occurred and transaction.type != MemoryWriteMask.NONE:
-            word_addr = transaction.address & 0xFFFFFFFC
-            byte_mask = transaction.type.value
-            # Get existing word or 0
-            current_word = self.memory.get(word_addr, 0)
-            
-            new_word = current_word
-            for i in range(4):
-                if (byte_mask >> i) & 1:
-                    # Clear the byte
-                    mask = ~(0xFF << (8 * i)) & 0xFFFFFFFF
-                    # Insert the new byte from the aligned data
-                    new_byte = (transaction.data >> (8 * i)) & 0xFF
-                    new_word = (new_word & mask) | (new_byte << (8 * i))
-            
-            self.memory[word_addr] = new_word
-            
-            self.transactions_history.append({"addr": transaction.address, "mask": byte_mask, "val": transaction.data})
+        # A NONE strobe is 0, so an int test replaces the enum comparison
+        byte_mask = transaction.type.value
+        if not transaction.occurred or not byte_mask:
+            return
+
+        address, data = transaction.address, transaction.data
+        memory = self.memory
+        word_addr = address & 0xFFFFFFFC
+
+        # Strobe bits select whole bytes: keep the old bytes outside the lane mask, take the new ones inside it
+        keep, insert = _STROBE_MERGE_MASKS[byte_mask]
+        memory[word_addr] = (memory.get(word_addr, 0) & keep) | (data & insert)
 
     def load_data(self, address: int) -> int:
         """
@@ -45,14 +206,26 @@ class SimulatedDataMemory:
         """
         return self.memory.copy()
 
+    def get_memory_view(self) -> Mapping[int, int]:
+        """
+        Returns a read-only live view of the memory state, without copying it.
+        """
+        return MappingProxyType(self.memory)
+
 class CPUModel:
+    __slots__ = ("data_memory", "_tooltip_plan")
+
     def __init__(self):
         self.data_memory = SimulatedDataMemory()
+        # (group id, component name, bound function) per SVG group, resolved once for every refresh
+        self._tooltip_plan = tuple(
+            (group_id, details["component"], details["function"])
+            for group_id, details in self.return_component_mapping().items()
+        )
        
     def reset(self, initial_memory: dict[int, int]):
-        self.data_memory = SimulatedDataMemory()
-        for addr, val in initial_memory.items():
-            self.data_memory.memory[addr] = val
+        # One C-level bulk copy of the image instead of a Python-level insert per word
+        self.data_memory = SimulatedDataMemory(memory=dict(initial_memory))
 
     def perform_memory_transaction(self, transaction: AtomicMemTransaction):
         self.data_memory.store_data(transaction)  
@@ -92,13 +265,8 @@ class CPUModel:
         Extracts Opcode, RD, RS1, RS2, Funct3, and Funct7 from the instruction word.
         """
         inst_val = pipeline_status.if_id_status.instruction_if.word
-        # Logic: Bit Extraction
-        opcode = extract_bits(inst_val, 0, 7)
-        rd     = extract_bits(inst_val, 7, 5)
-        funct3 = extract_bits(inst_val, 12, 3)
-        rs1    = extract_bits(inst_val, 15, 5)
-        rs2    = extract_bits(inst_val, 20, 5)
-        funct7 = extract_bits(inst_val, 25, 7)
+        # Logic: Bit Extraction (cached per instruction word)
+        opcode, rd, funct3, rs1, rs2, funct7 = _decode_fields(inst_val)
         
         outputs = {
             "opcode": opcode,
@@ -119,56 +287,15 @@ class CPUModel:
                     f"Funct7: 0b{funct7:07b}")
         return outputs
 
-    def imm_gen_inst(self, pipeline_status: PipelineStatus, return_str: bool = False):
-        inst_val = pipeline_status.if_id_status.instruction_if.word
-        
-        opcode = extract_bits(inst_val, 0, 7)
-        imm = 0
-        fmt = "Unknown"
-
-        # I-Type: Arithmetic, Loads, JALR
-        if opcode in [0x13, 0x03, 0x67]:
-            fmt = "I-Type"
-            imm_11_0 = extract_bits(inst_val, 20, 12)
-            # Sign extend 12 bits to 32
-            imm = (imm_11_0 ^ 0x800) - 0x800 if (imm_11_0 & 0x800) else imm_11_0
-
-        # S-Type: Stores
-        elif opcode == 0x23:
-            fmt = "S-Type"
-            imm_11_5 = extract_bits(inst_val, 25, 7)
-            imm_4_0  = extract_bits(inst_val, 7, 5)
-            raw_imm = (imm_11_5 << 5) | imm_4_0
-            imm = (raw_imm ^ 0x800) - 0x800 if (raw_imm & 0x800) else raw_imm
-
-        # B-Type: Branches
-        elif opcode == 0x63:
-            fmt = "B-Type"
-            imm_12   = extract_bits(inst_val, 31, 1)
-            imm_11   = extract_bits(inst_val, 7, 1)
-            imm_10_5 = extract_bits(inst_val, 25, 6)
-            imm_4_1  = extract_bits(inst_val, 8, 4)
-            raw_imm = (imm_12 << 12) | (imm_11 << 11) | (imm_10_5 << 5) | (imm_4_1 << 1)
-            imm = (raw_imm ^ 0x1000) - 0x1000 if (raw_imm & 0x1000) else raw_imm
-
-        # U-Type: LUI, AUIPC
-        elif opcode in [0x37, 0x17]:
-            fmt = "U-Type"
-            imm = (extract_bits(inst_val, 12, 20) << 12) & 0xFFFFFFFF
-
-        # J-Type: JAL
-        elif opcode == 0x6F:
-            fmt = "J-Type"
-            imm_20    = extract_bits(inst_val, 31, 1)
-            imm_19_12 = extract_bits(inst_val, 12, 8)
-            imm_11    = extract_bits(inst_val, 20, 1)
-            imm_10_1  = extract_bits(inst_val, 21, 10)
-            raw_imm = (imm_20 << 20) | (imm_19_12 << 12) | (imm_11 << 11) | (imm_10_1 << 1)
-            imm = (raw_imm ^ 0x100000) - 0x100000 if (raw_imm & 0x100000) else raw_imm
+    def _compute_imm_gen(self, pipeline_status: PipelineStatus) -> int:
+        # One table lookup on the opcode replaces the format if/elif ladder
+        return _decode_immediate(pipeline_status.if_id_status.instruction_if.word)[1] & 0xFFFFFFFF
 
+    def imm_gen_inst(self, pipeline_status: PipelineStatus, return_str: bool = False):
         if return_str:
+            fmt, imm = _decode_immediate(pipeline_status.if_id_status.instruction_if.word)
             return f"Format: {fmt}\nExt. Immediate: 0x{imm & 0xFFFFFFFF:08X} ({imm})"
-        return imm & 0xFFFFFFFF
+        return self._compute_imm_gen(pipeline_status)
 
     def forwarding_unit_inst(self, pipeline_status: PipelineStatus, return_str: bool = False):
         hz = pipeline_status.hazard_status
@@ -179,40 +306,15 @@ class CPUModel:
         return hz.rs1_data_source, hz.rs2_data_source
 
     def control_inst(self,pipeline_status: PipelineStatus, return_str: bool = False):
-        # Retrieve opcode from our decoder component
-        decoded = self.decoder_inst(pipeline_status)
-        opcode = decoded["opcode"]
+        # Retrieve opcode from the decoder's cached fields
+        opcode = _decode_fields(pipeline_status.if_id_status.instruction_if.word)[0]
         
         # force_nop logic comes from the hazard unit (e.g., a Load-Use stall)
         # We check if the hazard status indicates we are forcing a bubble
         force_nop = pipeline_status.hazard_status.load_use_hazard.value
 
-        # Default Safety State (NOP behavior)
-        res = {
-            "is_halt": False, "is_branch": False, "is_jal": False, "is_jalr": False,
-            "mem_write_en": False, "mem_read_en": False, "reg_write_en": False,
-            "rd_src_optn": 0, "alu_intent": 0, "alu_src_optn": 0
-        }
-
-        if not force_nop:
-            if opcode == 0x33: # OP_R_TYPE
-                res.update({"reg_write_en": True, "alu_intent": 2, "rd_src_optn": 0, "alu_src_optn": 0})
-            elif opcode == 0x13: # OP_I_TYPE
-                res.update({"reg_write_en": True, "alu_intent": 3, "rd_src_optn": 0, "alu_src_optn": 1})
-            elif opcode == 0x03: # OP_LOAD
-                res.update({"reg_write_en": True, "mem_read_en": True, "rd_src_optn": 1, "alu_intent": 0, "alu_src_optn": 1})
-            elif opcode == 0x23: # OP_STORE
-                res.update({"mem_write_en": True, "alu_intent": 0, "alu_src_optn": 1})
-            elif opcode == 0x63: # OP_BRANCH
-                res.update({"is_branch": True, "alu_intent": 1, "alu_src_optn": 0})
-            elif opcode == 0x6F: # OP_JAL
-                res.update({"is_jal": True, "reg_write_en": True})
-            elif opcode == 0x67: # OP_JALR
-                res.update({"is_jalr": True, "reg_write_en": True, "alu_intent": 0, "alu_src_optn": 1})
-            elif opcode == 0x37 or opcode == 0x17: # OP_LUI / OP_AUIPC
-                res.update({"reg_write_en": True, "rd_src_optn": 0, "alu_intent": 0, "alu_src_optn": 1})
-            elif opcode == 0x73: # OP_SYSTEM
-                res.update({"is_halt": True})
+        # One lookup per opcode; unknown opcodes and forced bubbles keep the NOP defaults
+        res = _NOP_CONTROL if force_nop else _CONTROL_TABLE.get(opcode, _NOP_CONTROL)
 
         if return_str:
             if force_nop:
@@ -220,10 +322,8 @@ class CPUModel:
             return "\n".join([f"{k.upper()}: {v}" for k, v in res.items()])
         return res
 
-    def reg_file_inst(self, pipeline_status: PipelineStatus, return_str: bool = False):
-        decoded = self.decoder_inst(pipeline_status)
-        rs1_addr = decoded["rs1"]
-        rs2_addr = decoded["rs2"]
+    def _compute_reg_file(self, pipeline_status: PipelineStatus) -> tuple[int, int]:
+        _, _, _, rs1_addr, rs2_addr, _ = _decode_fields(pipeline_status.if_id_status.instruction_if.word)
         
         # register_file is a RegisterFile object with .entries
         rf = pipeline_status.register_file.entries
@@ -231,91 +331,74 @@ class CPUModel:
         # RISC-V: x0 is always 0
         val1 = rf[rs1_addr].value if rs1_addr != 0 else 0
         val2 = rf[rs2_addr].value if rs2_addr != 0 else 0
+        return val1, val2
+
+    def reg_file_inst(self, pipeline_status: PipelineStatus, return_str: bool = False):
+        val1, val2 = self._compute_reg_file(pipeline_status)
         
         if return_str:
+            _, _, _, rs1_addr, rs2_addr, _ = _decode_fields(pipeline_status.if_id_status.instruction_if.word)
             return f"x{rs1_addr} (RS1): 0x{val1:08X}\nx{rs2_addr} (RS2): 0x{val2:08X}"
         return val1, val2
 
-    def rs1_data_selector(self, pipeline_status: PipelineStatus, return_str: bool = False):
+    def _compute_rs1_data(self, pipeline_status: PipelineStatus) -> int:
         # Get raw value from RegFile
-        rf_val1, _ = self.reg_file_inst(pipeline_status)
+        rf_val1, _ = self._compute_reg_file(pipeline_status)
         
         # Get forwarding selection from Hazard Status
         sel = pipeline_status.hazard_status.rs1_data_source # This is an RSn_Source Enum
-        
-        # Forwarding Sources
-        # 0: REG_FILE_AT_ID
-        # 1: RD_DATA_AT_EX  (From rd_data_ex)
-        # 2: RD_DATA_AT_MEM (From alu_result_mem or rd_data_mem)
-        # 3: RD_DATA_AT_WB  (From final_rd_data_wb)
-        
-        val = rf_val1 # Default
-        if sel == RSn_Source.RD_DATA_AT_EX:
-            # Note: We'd need to calculate rd_data_ex if not in status, 
-            # but usually available from previous cycle data
-            val = pipeline_status.ex_mem_status.alu_result_ex 
-        elif sel == RSn_Source.RD_DATA_AT_MEM:
-            # In Verilog: mem_forwarding_data = (rd_src_optn_mem) ? rd_data_mem : alu_result_mem;
-            ex_mem = pipeline_status.ex_mem_status
-            val = ex_mem.alu_result_ex # Simplified for this snapshot context
-        elif sel == RSn_Source.RD_DATA_AT_WB:
-            # final_rd_data_wb: selects between execution_data_mem and memory_data_mem
-            wb = pipeline_status.mem_wb_status
-            val = wb.memory_data_mem if wb.rd_src_mem.value == 1 else wb.execution_data_mem
+        return _RS_SOURCES[sel](pipeline_status, rf_val1)
+
+    def rs1_data_selector(self, pipeline_status: PipelineStatus, return_str: bool = False):
+        val = self._compute_rs1_data(pipeline_status)
 
         if return_str:
-            return f"RS1 Final Data: 0x{val & 0xFFFFFFFF:08X} (Source: {sel})"
-        return val & 0xFFFFFFFF
+            return f"RS1 Final Data: 0x{val:08X} (Source: {pipeline_status.hazard_status.rs1_data_source})"
+        return val
 
-    def rs2_data_selector(self, pipeline_status: PipelineStatus, return_str: bool = False):
-        _, rf_val2 = self.reg_file_inst(pipeline_status)
+    def _compute_rs2_data(self, pipeline_status: PipelineStatus) -> int:
+        _, rf_val2 = self._compute_reg_file(pipeline_status)
         sel = pipeline_status.hazard_status.rs2_data_source
-        
-        val = rf_val2
-        if sel == RSn_Source.RD_DATA_AT_EX:
-            val = pipeline_status.ex_mem_status.alu_result_ex
-        elif sel == RSn_Source.RD_DATA_AT_MEM:
-            val = pipeline_status.ex_mem_status.alu_result_ex
-        elif sel == RSn_Source.RD_DATA_AT_WB:
-            wb = pipeline_status.mem_wb_status
-            val = wb.memory_data_mem if wb.rd_src_mem.value == 1 else wb.execution_data_mem
+        return _RS_SOURCES[sel](pipeline_status, rf_val2)
 
-        if return_str:
-            return f"RS2 Final Data: 0x{val & 0xFFFFFFFF:08X} (Source: {sel})"
-        return val & 0xFFFFFFFF
+    def rs2_data_selector(self, pipeline_status: PipelineStatus, return_str: bool = False):
+        val = self._compute_rs2_data(pipeline_status)
 
-    def forwarding_unit_inst(self, pipeline_status: PipelineStatus, return_str: bool = False):
-        hz = pipeline_status.hazard_status
-        
         if return_str:
-            return (f"RS1 Mux Select: {hz.rs1_data_source}\n"
-                    f"RS2 Mux Select: {hz.rs2_data_source}")
-        return hz.rs1_data_source, hz.rs2_data_source
+            return f"RS2 Final Data: 0x{val:08X} (Source: {pipeline_status.hazard_status.rs2_data_source})"
+        return val
 
     def comparator(self, pipeline_status: PipelineStatus, return_str: bool = False):
         # Retrieve forwarded data from RS selectors
-        rs1_val = self.rs1_data_selector(pipeline_status)
-        rs2_val = self.rs2_data_selector(pipeline_status)
+        rs1_val = self._compute_rs1_data(pipeline_status)
+        rs2_val = self._compute_rs2_data(pipeline_status)
         
-        # Subtraction logic to find difference
-        # result = rs1 - rs2
-        diff = (rs1_val - rs2_val) & 0xFFFFFFFF
-        zero_id = (diff == 0)
+        # Subtraction logic to find difference: (rs1 - rs2) mod 2^32 is zero exactly when
+        # the two 32-bit operands are equal
+        zero_id = rs1_val == rs2_val
         
         if return_str:
             return (f"RS1: 0x{rs1_val:08X}, RS2: 0x{rs2_val:08X}\n"
                     f"Comparison Result: {'MATCH (Zero=1)' if zero_id else 'MISMATCH (Zero=0)'}")
         return zero_id
 
-    def target_base_selector(self, pipeline_status: PipelineStatus, return_str: bool = False):
-        controls = self.control_inst(pipeline_status)
-        pc_id = pipeline_status.if_id_status.program_counter_if.value
-        rs1_val = self.rs1_data_selector(pipeline_status)
-        
+    def _is_jalr_id(self, pipeline_status: PipelineStatus) -> bool:
+        """The control unit's is_jalr output, read from the same table control_inst uses."""
+        if pipeline_status.hazard_status.load_use_hazard.value:
+            return _NOP_CONTROL["is_jalr"]
+        opcode = _decode_fields(pipeline_status.if_id_status.instruction_if.word)[0]
+        return _CONTROL_TABLE.get(opcode, _NOP_CONTROL)["is_jalr"]
+
+    def _target_base(self, pipeline_status: PipelineStatus, is_jalr: bool) -> int:
         # mux2 target_base_selector
         # .d0_i (pc_id), .d1_i (rs1_data_id), .sel_i (is_jalr_id)
-        is_jalr = controls["is_jalr"]
-        val = rs1_val if is_jalr else pc_id
+        if is_jalr:
+            return self._compute_rs1_data(pipeline_status)
+        return pipeline_status.if_id_status.program_counter_if.value
+
+    def target_base_selector(self, pipeline_status: PipelineStatus, return_str: bool = False):
+        is_jalr = self._is_jalr_id(pipeline_status)
+        val = self._target_base(pipeline_status, is_jalr)
         
         if return_str:
             source = "RS1 (JALR)" if is_jalr else "PC (JAL/Branch)"
@@ -323,13 +406,12 @@ class CPUModel:
         return val
 
     def final_target_adder(self, pipeline_status: PipelineStatus, return_str: bool = False):
+        # Check if we are executing a JALR to select the base and apply masking
+        is_jalr = self._is_jalr_id(pipeline_status)
+
         # Inputs from previous components
-        imm = self.imm_gen_inst(pipeline_status)
-        target_base = self.target_base_selector(pipeline_status)
-        
-        # Check if we are executing a JALR to apply masking
-        controls = self.control_inst(pipeline_status)
-        is_jalr = controls["is_jalr"]
+        imm = self._compute_imm_gen(pipeline_status)
+        target_base = self._target_base(pipeline_status, is_jalr)
         
         # Perform addition
         raw_target_addr_id = (imm + target_base) & 0xFFFFFFFF
@@ -347,96 +429,65 @@ class CPUModel:
         return final_target
 
     def pc_src_selector(self, pipeline_status: PipelineStatus, return_str: bool = False):
-
-        
-        # jump/branch target
-        jump_target = self.final_target_adder(pipeline_status)
-        
-        # Selection signal comes from flow_change (control_hazard)
+        # Selection signal comes from flow_change (control_hazard); the target value itself is
+        # shown by final_target_adder, so it is not recomputed here
         flow_change = pipeline_status.hazard_status.control_hazard.value
    
         src = "Target Adder (Jump/Branch Taken)" if flow_change else "PC+4 (Sequential)"
         return f"Selected Next PC: via {src}"
         
 
-    def alu_ctrl_inst(self, pipeline_status: PipelineStatus, return_str: bool = False):
+    def _compute_alu_ctrl(self, pipeline_status: PipelineStatus) -> int:
         id_ex = pipeline_status.id_ex_status
         intent = id_ex.alu_intent_id.value
         f3 = id_ex.funct3_id
         f7_bit30 = (id_ex.funct7_id >> 5) & 1 # Bit 30 of instruction is bit 5 of funct7
 
-        # Operation codes matching your localparams
-        OP_ADD, OP_SUB, OP_SLL, OP_SLT = 0x0, 0x8, 0x1, 0x2
-        OP_SLTU, OP_XOR, OP_SRL, OP_SRA = 0x3, 0x4, 0x5, 0xD
-        OP_OR, OP_AND, OP_NOT_USED = 0x6, 0x7, 0xF
-
-        alu_op = OP_ADD # Default safe
-
-        if intent == 0:   # 00: Load/Store
-            alu_op = OP_ADD
-        elif intent == 1: # 01: Branch
-            alu_op = OP_NOT_USED
-        else:             # 10 (R-Type) or 11 (I-Type)
-            if f3 == 0x0: # ADD/SUB
-                # Only R-Type (10) distinguishes SUB via bit 30
-                alu_op = OP_SUB if (intent == 2 and f7_bit30) else OP_ADD
-            elif f3 == 0x1: alu_op = OP_SLL
-            elif f3 == 0x2: alu_op = OP_SLT
-            elif f3 == 0x3: alu_op = OP_SLTU
-            elif f3 == 0x4: alu_op = OP_XOR
-            elif f3 == 0x5: # SRL/SRA
-                alu_op = OP_SRA if f7_bit30 else OP_SRL
-            elif f3 == 0x6: alu_op = OP_OR
-            elif f3 == 0x7: alu_op = OP_AND
+        # 64 possible (intent, funct3, bit 30) inputs, all decoded once at import
+        return _ALU_CTRL_LUT[(intent << 4) | (f3 << 1) | f7_bit30]
+
+    def alu_ctrl_inst(self, pipeline_status: PipelineStatus, return_str: bool = False):
+        alu_op = self._compute_alu_ctrl(pipeline_status)
 
         if return_str:
             return f"ALU Operation Code: 0b{alu_op:04b} ({AluOpCode(alu_op).name})"
         return alu_op
 
-    def alu_src_selector(self, pipeline_status: PipelineStatus, return_str: bool = False):
+    def _compute_alu_src(self, pipeline_status: PipelineStatus) -> int:
         id_ex = pipeline_status.id_ex_status
         
         # .d0_i (rs2_data_ex), .d1_i (imm_ex), .sel_i (alu_src_optn_ex)
-        sel = id_ex.alu_src_optn_id.value
-        val = id_ex.imm_id if sel == 1 else id_ex.rs2_data_id
+        return id_ex.imm_id if id_ex.alu_src_optn_id.value == 1 else id_ex.rs2_data_id
+
+    def alu_src_selector(self, pipeline_status: PipelineStatus, return_str: bool = False):
+        val = self._compute_alu_src(pipeline_status)
         
         if return_str:
-            source = "Immediate" if sel == 1 else "Register (RS2)"
-            return f"ALU Operand 2: 0x{val & 0xFFFFFFFF:08X} (Source: {source})"
-        return val & 0xFFFFFFFF
+            source = "Immediate" if pipeline_status.id_ex_status.alu_src_optn_id.value == 1 else "Register (RS2)"
+            return f"ALU Operand 2: 0x{val:08X} (Source: {source})"
+        return val
+
+    def _compute_pc_plus_4_ex(self, pipeline_status: PipelineStatus) -> int:
+        return (pipeline_status.id_ex_status.pc_id.value + 4) & 0xFFFFFFFF
 
     def fixed_pc_adder_inst_ex(self, pipeline_status: PipelineStatus, return_str: bool = False):
-        pc_ex = pipeline_status.id_ex_status.pc_id.value
-        pc_plus_4 = (pc_ex + 4) & 0xFFFFFFFF
+        pc_plus_4 = self._compute_pc_plus_4_ex(pipeline_status)
         
         if return_str:
             return f"EX Stage PC+4: 0x{pc_plus_4:08X}"
         return pc_plus_4
 
-    def alu_inst(self, pipeline_status: PipelineStatus, return_str: bool = False):
+    def _compute_alu(self, pipeline_status: PipelineStatus) -> int:
         op1 = pipeline_status.id_ex_status.rs1_data_id
-        op2 = self.alu_src_selector(pipeline_status)
-        operation = self.alu_ctrl_inst(pipeline_status)
-
-        # Helper for signed interpretation
-        def to_signed(n):
-            return n - (1 << 32) if n & (1 << 31) else n
-
-        res = 0
-        if   operation == 0x0: res = op1 + op2                             # ADD
-        elif operation == 0x8: res = op1 - op2                             # SUB
-        elif operation == 0x1: res = op1 << (op2 & 0x1F)                   # SLL
-        elif operation == 0x5: res = (op1 & 0xFFFFFFFF) >> (op2 & 0x1F)    # SRL
-        elif operation == 0xD: res = to_signed(op1) >> (op2 & 0x1F)        # SRA
-        elif operation == 0x2: res = 1 if to_signed(op1) < to_signed(op2) else 0 # SLT
-        elif operation == 0x3: res = 1 if (op1 & 0xFFFFFFFF) < (op2 & 0xFFFFFFFF) else 0 # SLTU
-        elif operation == 0x4: res = op1 ^ op2                             # XOR
-        elif operation == 0x6: res = op1 | op2                             # OR
-        elif operation == 0x7: res = op1 & op2                             # AND
-        elif operation == 0xF: res = 0xFFFFFFFF                            # NOT_USED/DEBUG
-
-        res &= 0xFFFFFFFF # Ensure 32-bit result
-        print("this is executed and this is the result", res)
+        op2 = self._compute_alu_src(pipeline_status)
+        operation = self._compute_alu_ctrl(pipeline_status)
+
+        # Indexed dispatch on the 4-bit ALU op code; unused codes yield 0
+        return _ALU_OPS[operation & 0xF](op1, op2) & 0xFFFFFFFF # Ensure 32-bit result
+
+    def alu_inst(self, pipeline_status: PipelineStatus, return_str: bool = False):
+        res = self._compute_alu(pipeline_status)
+
         if return_str:
             return f"ALU Result: 0x{res:08X}"
         return res
@@ -444,8 +495,8 @@ class CPUModel:
     def rd_data_ex_selector(self, pipeline_status: PipelineStatus, return_str: bool = False):
         id_ex = pipeline_status.id_ex_status
         
-        alu_res = self.alu_inst(pipeline_status)
-        pc_plus_4 = self.fixed_pc_adder_inst_ex(pipeline_status)
+        alu_res = self._compute_alu(pipeline_status)
+        pc_plus_4 = self._compute_pc_plus_4_ex(pipeline_status)
         
         # assign rd_data_ex = (is_jal_ex | is_jalr_ex) ? pc_plus_4_ex : alu_result_ex;
         sel = id_ex.is_jal_id.value or id_ex.is_jalr_id.value
@@ -464,45 +515,20 @@ class CPUModel:
         addr_lsb = addr & 0x3
         rs2_data = ex_mem.store_data_ex
 
-        is_halt = ex_mem.is_halt_ex.value
         mem_write_en = ex_mem.mem_write_ex.value
         mem_read_en = ex_mem.mem_read_ex.value
-        pc = ex_mem.pc_ex.value
-        rd = ex_mem.rd_ex
 
         # --- 1. Store Logic (Outputs to RAM) ---
-        byte_mask = 0
-        ram_wdata = 0
-
-        if f3 == 0b000:   # SB
-            byte_mask = 1 << addr_lsb
-            ram_wdata = (rs2_data & 0xFF) << (8 * addr_lsb)
-        elif f3 == 0b001: # SH
-            byte_mask = 0b0011 if addr_lsb < 2 else 0b1100
-            ram_wdata = (rs2_data & 0xFFFF) << (16 * (addr_lsb >> 1))
-        elif f3 == 0b010: # SW
-            byte_mask = 0b1111
-            ram_wdata = rs2_data
+        # SB/SH/SW lane and data alignment per (funct3, address LSBs); other funct3 values write nothing
+        byte_mask, data_mask, shift = _STORE_LUT[(f3 << 2) | addr_lsb]
+        ram_wdata = (rs2_data & data_mask) << shift
 
         # --- 2. Load Logic (Inputs from Simulated RAM) ---
         raw_ram_data = self.data_memory.load_data(addr)
-        
-        def sign_ext(val, bits):
-            return (val ^ (1 << (bits - 1))) - (1 << (bits - 1)) if (val & (1 << (bits - 1))) else val
-
-        final_read = 0
-        if f3 == 0b000: # LB
-            byte = (raw_ram_data >> (8 * addr_lsb)) & 0xFF
-            final_read = sign_ext(byte, 8)
-        elif f3 == 0b001: # LH
-            half = (raw_ram_data >> (16 * (addr_lsb >> 1))) & 0xFFFF
-            final_read = sign_ext(half, 16)
-        elif f3 == 0b010: # LW
-            final_read = raw_ram_data
-        elif f3 == 0b100: # LBU
-            final_read = (raw_ram_data >> (8 * addr_lsb)) & 0xFF
-        elif f3 == 0b101: # LHU
-            final_read = (raw_ram_data >> (16 * (addr_lsb >> 1))) & 0xFFFF
+
+        # LB/LH/LW/LBU/LHU extraction; the sign bit is 0 for unsigned and word loads
+        shift, width_mask, sign = _LOAD_LUT[(f3 << 2) | addr_lsb]
+        final_read = (((raw_ram_data >> shift) & width_mask) ^ sign) - sign
 
         if return_str:
             if mem_write_en:
@@ -539,8 +565,8 @@ class CPUModel:
         
         if return_str:
             source = "Simulated RAM (Load)" if sel == 1 else "Latched Exec Data (ALU/Link)"
-            return f"Final MEM Result: 0x{final_val & 0xFFFFFFFF:08X} (Source: {source})"
-        return final_val & 0xFFFFFFFF
+            return f"Final MEM Result: 0x{final_val:08X} (Source: {source})"
+        return final_val
     
     def rd_src_selector(self, pipeline_status: PipelineStatus, return_str: bool = False):
         wb = pipeline_status.mem_wb_status
@@ -551,8 +577,8 @@ class CPUModel:
         
         if return_str:
             source = "Simulated RAM (Load)" if sel == 1 else "Latched Exec Data (ALU/Link)"
-            return f"Final WB Result to RegFile: 0x{val & 0xFFFFFFFF:08X} (Source: {source})"
-        return val & 0xFFFFFFFF
+            return f"Final WB Result to RegFile: 0x{val:08X} (Source: {source})"
+        return val
 
     def if_id_reg_status(self, pipeline_status: PipelineStatus, return_str: bool = False):
         hzrd = pipeline_status.hazard_status    
@@ -774,18 +800,9 @@ class CPUModel:
             """
             Generates a dictionary mapping SVG group IDs to formatted tooltip strings.
             """
-            mapping = self.return_component_mapping()
-            group_to_tooltip = {}
-
-            for group_id, details in mapping.items():
-                component_name = details['component']
-                component_func = details['function']
-                
-                # Execute the mapped function with the required parameters
-                tooltip_text = component_func( pipeline_status, return_str=True)
-                
-                # Construct the final display string: "Component Name: Status/Value"
-                group_to_tooltip[group_id] = f"{component_name}: {tooltip_text}"
-
-            return group_to_tooltip
+            # Execute each mapped function and build the final display string: "Component Name: Status/Value"
+            return {
+                group_id: f"{component_name}: {component_func(pipeline_status, return_str=True)}"
+                for group_id, component_name, component_func in self._tooltip_plan
+            }
 cpu_model = CPUModel()
@@ -1,6 +1,9 @@
 import serial
 import time
 import sys
+import queue
+import threading
+from collections import namedtuple
 from typing import Tuple, List
 import logging
 
@@ -13,7 +16,9 @@ from backend.schemes import (
     MemPatch, 
     AtomicMemTransaction, 
     MemoryDumpMode, 
-    unpack_words
+    unpack_words,
+    PIPELINE_WORD_COUNT,
+    WORD_SIZE_BYTES
 )
 
 BAUD_RATE = 115200
@@ -23,6 +28,16 @@ CMD_MODE_CONT  = 0xCE
 CMD_MODE_STEP  = 0xDE
 CMD_STEP_NEXT  = 0xAE
 
+PIPELINE_BYTES = PIPELINE_WORD_COUNT * WORD_SIZE_BYTES
+# Mode byte + pipeline words + pad word + first memory word
+PACKET_PREFIX_SIZE = 1 + PIPELINE_BYTES + 2 * WORD_SIZE_BYTES
+
+RAW_LOG_BUFFER_SIZE = 1 << 16
+
+# One received packet: the bytes read up to each 0xDA, the fixed-size prefix, the memory bytes
+# read after it, their decoded words, and the decoded pipeline/memory objects
+Packet = namedtuple('Packet', 'preamble prefix tail mem_words status mem')
+
 class SerialManager:
     def __init__(self, port: str, baud: int):
         # timeout=None ensures blocking reads, vital for waiting on sync bytes
@@ -31,100 +46,100 @@ class SerialManager:
         self.fmt_log_file = "formatted_log.txt"
         self.last_register_file = None
         
-        # Clear/Init files on start
-        with open(self.raw_log_file, 'w') as f: 
-            f.write("--- RAW HEX DUMP ---\n")
+        # Clear/Init files on start. The raw log stays open, with a 64 KiB write buffer, so dumps
+        # never reopen it; each packet is flushed once so a killed session keeps its log
+        self.raw_log_handle = open(self.raw_log_file, 'w', buffering=RAW_LOG_BUFFER_SIZE)
+        self.raw_log_handle.write("--- RAW HEX DUMP ---\n")
+        self.raw_log_handle.flush()
         with open(self.fmt_log_file, 'w', encoding="utf-8") as f: 
             f.write("--- FORMATTED DUMP ---\n")
 
     def log_raw(self, words: List[int], tag: str):
         """Logs raw 32-bit integers to a text file for debugging byte alignment."""
-        with open(self.raw_log_file, 'a') as f:
-            f.write(f"\n[{tag}] Timestamp: {time.time()}\n")
-            for i, w in enumerate(words):
-                f.write(f"{i:03}: 0x{w:08X}\n")
+        f = self.raw_log_handle
+        f.write(f"\n[{tag}] Timestamp: {time.time()}\n")
+        for i, w in enumerate(words):
+            f.write(f"{i:03}: 0x{w:08X}\n")
+        f.flush()
+
+    def close(self):
+        """Flushes the raw log and releases the serial port."""
+        self.raw_log_handle.close()
+        self.ser.close()
 
     def list_only_diffs(self, current_rf):
         """Compares current register file to last logged one and lists only differences."""
         if self.last_register_file is None:
             return str(current_rf)  # No previous data, return full
         
-        output = []
-        for i in range(32):
-            old_val = self.last_register_file.entries[i].value
-            new_val = current_rf.entries[i].value
-            if old_val != new_val:
-                output.append(f"R{i:02}: 0x{old_val:08X} -> 0x{new_val:08X}")
-        
-        if not output:
+        old_values = self.last_register_file.values
+        new_values = current_rf.values
+        if old_values == new_values:
             return "No changes in Register File."
-        
-        return "\n".join(output)
+
+        # The arrays differ, so at least one register changed; only those rows get formatted
+        return "\n".join([
+            f"R{i:02}: 0x{old_val:08X} -> 0x{new_val:08X}"
+            for i, (old_val, new_val) in enumerate(zip(old_values, new_values))
+            if old_val != new_val
+        ])
 
     def log_formatted(self, status: PipelineStatus, mem_obj):
-        """Logs the human-readable string representation of the objects."""
+        """Logs the human-readable string representation of the objects as a single record."""
+        if not clean_out.isEnabledFor(logging.INFO):
+            # Skip every str() conversion, but keep the baseline the next register diff compares against
+            if not status.hazard_status.program_ended.value:
+                self.last_register_file = status.register_file
+            return
+
         output = []
 
-        header_output = []
         sep = "=" * 60
-        header_output.append(sep)
-        header_output.append(f"CAPTURE TIMESTAMP: {time.time()}")
-        header_output.append(f"MODE: {status.memory_dump_mode}")
-        header_output.append(sep)
-        clean_out.info("\n".join(header_output))
-        
- 
-        hazard_output = []
-        hazard_output.append("\n>> HAZARD STATUS")
-        hazard_output.append(str(status.hazard_status))
-        clean_out.info("\n".join(hazard_output))
+        output.append(sep)
+        output.append(f"CAPTURE TIMESTAMP: {time.time()}")
+        output.append(f"MODE: {status.memory_dump_mode}")
+        output.append(sep)
+
+        output.append("\n>> HAZARD STATUS")
+        output.append(str(status.hazard_status))
 
-        reg_file_output = []
         if status.hazard_status.program_ended.value:
-            reg_file_output.append("\n>>FINAL REGISTER FILE")
-            reg_file_output.append(str(status.register_file))
+            output.append("\n>>FINAL REGISTER FILE")
+            output.append(str(status.register_file))
         else:
-            reg_file_output.append("\n>>REGISTER FILE CHANGES")
-            reg_file_output.append(self.list_only_diffs(status.register_file))
+            output.append("\n>>REGISTER FILE CHANGES")
+            output.append(self.list_only_diffs(status.register_file))
             self.last_register_file = status.register_file
-        
-        clean_out.info("\n".join(reg_file_output))
-        
-        if_id_output = []
-        if_id_output.append("\n>> IF/ID STAGE STATUS")
-        if_id_output.append(str(status.if_id_status))
-        clean_out.info("\n".join(if_id_output))
-
-        id_ex_output = []
-        id_ex_output.append("\n>> ID/EX STAGE STATUS")
-        id_ex_output.append(str(status.id_ex_status))
-        clean_out.info("\n".join(id_ex_output))
-        
-        ex_mem_output = []
-        ex_mem_output.append("\n>> EX/MEM STAGE")
-        ex_mem_output.append(str(status.ex_mem_status))
-        clean_out.info("\n".join(ex_mem_output))
-
-        mem_wb_output = []
-        mem_wb_output.append("\n>> MEM/WB STAGE STATUS")
-        mem_wb_output.append(str(status.mem_wb_status))
-        clean_out.info("\n".join(mem_wb_output))
-
-        mem_update_output = []
-        mem_update_output.append("\n>> MEMORY UPDATE STATUS")
-        mem_update_output.append(str(mem_obj))
-        clean_out.info("\n".join(mem_update_output))
-        
-        clean_out.info(sep + "\n\n")
-        
+
+        output.append("\n>> IF/ID STAGE STATUS")
+        output.append(str(status.if_id_status))
+
+        output.append("\n>> ID/EX STAGE STATUS")
+        output.append(str(status.id_ex_status))
+
+        output.append("\n>> EX/MEM STAGE")
+        output.append(str(status.ex_mem_status))
+
+        output.append("\n>> MEM/WB STAGE STATUS")
+        output.append(str(status.mem_wb_status))
+
+        output.append("\n>> MEMORY UPDATE STATUS")
+        output.append(str(mem_obj))
+
+        output.append(sep + "\n\n")
+
+        # One record per packet: a single handler/UI round-trip instead of one per section
+        clean_out.info("\n".join(output))
 
 
     def wait_for_ack(self, expected_byte: int):
         """Blocks until the specific byte is echoed back by the FPGA."""
         clean_out.info(f"Waiting for ACK (0x{expected_byte:02X})...")
+        ack = bytes([expected_byte])
         while True:
-            b = self.ser.read(1)
-            if b and ord(b) == expected_byte:
+            # read_until scans for the ACK inside pyserial, skipping stray bytes in one call
+            data = self.ser.read_until(ack)
+            if data.endswith(ack):
                 clean_out.info("    ✅ ACK Received.")
                 return
             
@@ -133,115 +148,132 @@ class SerialManager:
         Waits for 0xDA, reads 50 pipeline words, decodes them, 
         then reads variable length memory words.
         """
-        # 1. Wait for Header (DA)
+        packet = self.receive_packet()
+        self.log_packet(packet)
+        return packet.status, packet.mem
+
+    def receive_packet(self) -> "Packet":
+        """
+        Reads and decodes one packet without logging anything, so it can run off the UI thread.
+        """
+        # 1. Wait for Header (DA), keeping any stray bytes read before it
+        alert = bytes([CMD_DUMP_ALERT])
+        preamble = []
         while True:
-            clean_out.info("Waiting for Pipeline Dump Alert (0xDA)...")
-            b = self.ser.read(1)
-            raw_out.info(f"<< {b.hex().upper() or 'nothing'}")
-            if b and ord(b) == CMD_DUMP_ALERT:
-                clean_out.info("🚨 Pipeline Dump Alert Received.")
+            b = self.ser.read_until(alert)
+            preamble.append(b)
+            if b.endswith(alert):
                 break
-        
-        # 2. Read Mode Byte: Step/Snoop (0) or Continuous/Range (1)
-        mode_byte = ord(self.ser.read(1))
-        dump_mode = MemoryDumpMode.SNOOP_BASED if mode_byte == 0 else MemoryDumpMode.RANGE_BASED
-        clean_out.info(f"📦 {dump_mode.name} Pipeline Packet Incoming...")
-
-        # 3. Read 50 Words (RegFile + Pipeline)
-        raw_pipe_data = self.ser.read(200)
-        clean_out.info("📥 Pipeline Data Received.")
 
-        pipe_words = unpack_words(raw_pipe_data, 50)
+        # 2. Mode byte, 50 pipeline words, the pad word and the first memory word (snoop flag or
+        #    range minimum) always arrive back to back, so they are fetched with a single read.
+        #    Each packet gets its own buffer: the previous one may still be waiting to be logged
+        prefix = bytearray(PACKET_PREFIX_SIZE)
+        self.ser.readinto(prefix)
 
-        for i in range(0, len(raw_pipe_data), 64):
-            chunk = raw_pipe_data[i:i+64]
-            hex_str = ' '.join(f'{byte:02X}' for byte in chunk)
-            raw_out.info(f"<< {hex_str}")
+        # Step/Snoop (0) or Continuous/Range (1)
+        dump_mode = MemoryDumpMode.SNOOP_BASED if prefix[0] == 0 else MemoryDumpMode.RANGE_BASED
 
-        # 4. Decode Pipeline Status
+        # 3. Decode Pipeline Status
+        pipe_words = unpack_words(memoryview(prefix)[1:1 + PIPELINE_BYTES], PIPELINE_WORD_COUNT)
         pipeline_status = PipelineStatus.unpack(dump_mode, pipe_words)
-        clean_out.info("✅ Pipeline Status Parsed and Decoded.")
-        
-        raw_mem_flag = self.ser.read(4) # This is a pad word before memory data
-        raw_out.info(f"<< {raw_mem_flag.hex().upper()}")
-        clean_out.info("📥 Memory Data Incoming...")
+        first_mem_word = int.from_bytes(prefix[-WORD_SIZE_BYTES:], 'little')
 
-        # 5. Read Memory Data Based on Mode. Only updated continuous mode for now.
+        # 4. Read Memory Data Based on Mode
         if dump_mode == MemoryDumpMode.SNOOP_BASED:
+            if first_mem_word == 0:
+                return Packet(preamble, prefix, b"", [], pipeline_status,
+                              AtomicMemTransaction.unpack([False, 0, 0]))
+
+            mem_snoop = self.ser.read(8)
+            mem_words = unpack_words(mem_snoop, 2)
+            return Packet(preamble, prefix, mem_snoop, mem_words, pipeline_status,
+                          AtomicMemTransaction.unpack([first_mem_word] + mem_words))
+
+        # The minimum address is the last word of the prefix; only the maximum is read now
+        raw_max_address = self.ser.read(4)
+        address_range = [first_mem_word, int.from_bytes(raw_max_address, 'little')]
+
+        if address_range[0] == 0xFFFFFFFF and address_range[1] == 0x00000000:
+            return Packet(preamble, prefix, raw_max_address, [], pipeline_status,
+                          MemPatch.unpack([0xFFFFFFFF, 0x00000000, 0x00000000]))
+
+        num_words = _range_word_count(*address_range)
+        memory_payload = self.ser.read(num_words * 4)
+        mem_words = unpack_words(memory_payload, num_words)
+
+        # Rebuild Full MemPatch Object
+        return Packet(preamble, prefix, raw_max_address, mem_words, pipeline_status,
+                      MemPatch.unpack(address_range + mem_words))
+
+    def log_packet(self, packet: "Packet"):
+        """Emits the Raw/Clean trace of a received packet, in the order its parts arrived."""
+        clean_out.info("Waiting for Pipeline Dump Alert (0xDA)...")
+        # Stray bytes before the alert are logged as one line, not one record per byte
+        for b in packet.preamble:
+            raw_out.info(f"<< {b.hex(' ').upper() or 'nothing'}")
+        clean_out.info("🚨 Pipeline Dump Alert Received.")
+
+        prefix = memoryview(packet.prefix)
+        pad_offset = 1 + PIPELINE_BYTES
+        dump_mode = packet.status.memory_dump_mode
+        clean_out.info(f"📦 {dump_mode.name} Pipeline Packet Incoming...")
+        clean_out.info("📥 Pipeline Data Received.")
 
-            raw_mem_flag = self.ser.read(4)
-            raw_out.info(f"<< {raw_mem_flag.hex().upper()}")
+        if raw_out.isEnabledFor(logging.INFO):
+            # One C-level hex conversion, split into 64-byte rows (3 chars per byte), sent as one record
+            hex_str = prefix[1:pad_offset].hex(' ').upper()
+            raw_out.info("\n".join(
+                f"<< {hex_str[i:i+191]}" for i in range(0, len(hex_str), 192)
+            ))
 
-            mem_flag_word = unpack_words(raw_mem_flag, 1)[0]
-            
+        clean_out.info("✅ Pipeline Status Parsed and Decoded.")
+        raw_out.info(f"<< {prefix[pad_offset:pad_offset + 4].hex().upper()}") # Pad word before memory data
+        clean_out.info("📥 Memory Data Incoming...")
+        raw_first_mem_word = prefix[pad_offset + 4:]
 
-            if mem_flag_word == 0:
+        if dump_mode == MemoryDumpMode.SNOOP_BASED:
+            raw_out.info(f"<< {raw_first_mem_word.hex().upper()}")
+            if not packet.tail:
                 clean_out.info("ℹ️ No Memory Write found.")
+                return
 
-                return pipeline_status, AtomicMemTransaction.unpack([False, 0, 0])
-
-            else:
-                clean_out.info("📊 Atomic Memory Write found...")
-
-                mem_snoop = self.ser.read(8)
-                self.log_raw(unpack_words(mem_snoop, 2), "MEMORY_SNOOP")
-
-                mem_atomic_transaction = AtomicMemTransaction.unpack(
-                    [mem_flag_word] + unpack_words(mem_snoop, 2)
-                )
-                clean_out.info("✅ Memory Snoop Data Received and Parsed.")
-
-                return pipeline_status, mem_atomic_transaction
-        
-        else:
-
-            raw_address_range = self.ser.read(8)
-            raw_out.info(f"<< {raw_address_range[0:4].hex().upper()}")
-            raw_out.info(f"<< {raw_address_range[4:8].hex().upper()}")
-            
-
-            address_range = unpack_words(raw_address_range, 2)
-            clean_out.info("📊 Reading Memory Continuous/Range Data...")
-
-            if address_range[0] == 0xFFFFFFFF and address_range[1] == 0x00000000:
-                clean_out.info("    ℹ️ No Memory Updates to patch in Continuous/Range Mode.")
-
-                return pipeline_status, MemPatch.unpack([0xFFFFFFFF, 0x00000000, 0x00000000])
-            else:
-                clean_out.info(f"   ℹ️ Memory Range Minimum Address: 0x{address_range[0]:08X}")
-                clean_out.info(f"   ℹ️ Memory Range Maximum Address: 0x{address_range[1]:08X}")
-            
-            clean_out.info("    ℹ️ Calculating Memory Payload Size...")
-            bytes_diff = address_range[1] - address_range[0]
-
-            if bytes_diff == 0:
-                num_words = 1
-            else:
-                num_words = ((bytes_diff - 1) // 4) + 2
-
-            # 3. Calculate total bytes expected
-            total_bytes_expected = num_words * 4
-
-            clean_out.info(f"    ℹ️ Range: {address_range[0]:08x} - {address_range[1]:08x}")
-            clean_out.info(f"    ℹ️ Expecting {num_words} words ({total_bytes_expected} bytes) of memory payload...")
-
-            # 4. Read Memory Payload
-            memory_payload = self.ser.read(total_bytes_expected)
-
-            # 5. Unpack Memory Payload
-            mem_payload_words = unpack_words(memory_payload, num_words)
-
-            for i in range(0, len(mem_payload_words), 2):
-                pair = mem_payload_words[i:i+2]
-                raw_out.info(f"<< {' '.join(f'{word:08X}' for word in pair)}")
-
-            clean_out.info("✅ Memory Payload Received and Parsed.")
-
-            # 6. Rebuild Full MemPatch Object
-            full_mem_words = address_range + mem_payload_words
-            mem_patch = MemPatch.unpack(full_mem_words)
-
-            return pipeline_status, mem_patch
+            clean_out.info("📊 Atomic Memory Write found...")
+            self.log_raw(packet.mem_words, "MEMORY_SNOOP")
+            clean_out.info("✅ Memory Snoop Data Received and Parsed.")
+            return
+
+        raw_out.info(f"<< {raw_first_mem_word.hex().upper()}")
+        raw_out.info(f"<< {packet.tail.hex().upper()}")
+        clean_out.info("📊 Reading Memory Continuous/Range Data...")
+
+        min_address, max_address = packet.mem.min_address, packet.mem.max_address
+        if min_address == 0xFFFFFFFF and max_address == 0x00000000:
+            clean_out.info("    ℹ️ No Memory Updates to patch in Continuous/Range Mode.")
+            return
+        clean_out.info(f"   ℹ️ Memory Range Minimum Address: 0x{min_address:08X}")
+        clean_out.info(f"   ℹ️ Memory Range Maximum Address: 0x{max_address:08X}")
+
+        clean_out.info("    ℹ️ Calculating Memory Payload Size...")
+        num_words = len(packet.mem_words)
+        clean_out.info(f"    ℹ️ Range: {min_address:08x} - {max_address:08x}")
+        clean_out.info(f"    ℹ️ Expecting {num_words} words ({num_words * 4} bytes) of memory payload...")
+
+        if raw_out.isEnabledFor(logging.INFO):
+            # Words are shown by value (MSB first), so format the ints rather than the LE bytes
+            word_hex = list(map("{:08X}".format, packet.mem_words))
+            raw_out.info("\n".join(
+                f"<< {' '.join(word_hex[i:i+2])}" for i in range(0, len(word_hex), 2)
+            ))
+
+        clean_out.info("✅ Memory Payload Received and Parsed.")
+
+def _range_word_count(min_address: int, max_address: int) -> int:
+    """Words the FPGA sends for an inclusive [min, max] range dump."""
+    bytes_diff = max_address - min_address
+    if bytes_diff == 0:
+        return 1
+    return ((bytes_diff - 1) // 4) + 2
 
 def execute_program(port: str):
 
@@ -249,34 +281,60 @@ def execute_program(port: str):
     logging.getLogger('riscv.clean').handlers[0].log_element.clear()
 
     manager = SerialManager(port, BAUD_RATE)
-    manager.ser.write(bytes([CMD_MODE_CONT]))
-    raw_out.info(">> CE")
-    manager.wait_for_ack(CMD_MODE_CONT)
-    raw_out.info("<< CE")
-    clean_out.info("Started Continuous Execution Mode via GUI.")
     try:
+        manager.ser.write(bytes([CMD_MODE_CONT]))
+        raw_out.info(">> CE")
+        manager.wait_for_ack(CMD_MODE_CONT)
+        raw_out.info("<< CE")
+        clean_out.info("Started Continuous Execution Mode via GUI.")
+
+        # CE Mode: FPGA streams packets automatically. A dedicated reader keeps draining
+        # the port while this thread formats and logs, so a slow UI never stalls the UART.
+        packets = queue.SimpleQueue()
+        reader = threading.Thread(target=_drain_packets, args=(manager, packets), daemon=True)
+        reader.start()
         while True:
-            # CE Mode: FPGA streams packets automatically
-            status, mem = manager.read_pipeline_packet()
+            packet = packets.get()
+            if isinstance(packet, BaseException):
+                raise packet
+            manager.log_packet(packet)
+            status, mem = packet.status, packet.mem
             manager.log_formatted(status, mem)
             if status.hazard_status.program_ended.value:
                 clean_out.info("⚠️ Program has ended. Exiting Continuous Mode.")
                 break
     except KeyboardInterrupt:
         clean_out.info("Stopping...")
+    finally:
+        manager.close()
     return status, mem
 
+def _drain_packets(manager: SerialManager, packets: queue.SimpleQueue):
+    """Reader thread: pushes received packets (or the error that stopped it) until the program ends.
+    It never logs; the consumer emits every record, so the UI log panels are only touched from one thread."""
+    try:
+        while True:
+            packet = manager.receive_packet()
+            packets.put(packet)
+            if packet.status.hazard_status.program_ended.value:
+                return
+    except Exception as e:
+        packets.put(e)
+
 def start_step_by_step_mode(port: str):
 
     logging.getLogger('riscv.raw').handlers[0].log_element.clear()
     logging.getLogger('riscv.clean').handlers[0].log_element.clear()
 
     manager = SerialManager(port, BAUD_RATE)
-    manager.ser.write(bytes([CMD_MODE_STEP]))
-    raw_out.info(">> DE")
-    manager.wait_for_ack(CMD_MODE_STEP)
-    raw_out.info("<< DE")
-    clean_out.info("➡️ Started Step-by-Step Execution Mode via GUI.")
+    try:
+        manager.ser.write(bytes([CMD_MODE_STEP]))
+        raw_out.info(">> DE")
+        manager.wait_for_ack(CMD_MODE_STEP)
+        raw_out.info("<< DE")
+        clean_out.info("➡️ Started Step-by-Step Execution Mode via GUI.")
+    finally:
+        manager.close()
 
 
 def perform_step(port: str):
@@ -285,9 +343,12 @@ def perform_step(port: str):
     logging.getLogger('riscv.clean').handlers[0].log_element.clear()
 
     manager = SerialManager(port, BAUD_RATE)
-    manager.ser.write(bytes([CMD_STEP_NEXT]))
-    raw_out.info(">> AE")
-    clean_out.info("➡️ Requested Next Step Execution from FPGA.")
-    status, mem = manager.read_pipeline_packet()
-    manager.log_formatted(status, mem)
+    try:
+        manager.ser.write(bytes([CMD_STEP_NEXT]))
+        raw_out.info(">> AE")
+        clean_out.info("➡️ Requested Next Step Execution from FPGA.")
+        status, mem = manager.read_pipeline_packet()
+        manager.log_formatted(status, mem)
+    finally:
+        manager.close()
     return status, mem
@@ -1,146 +1,175 @@
-from dataclasses import dataclass, field
 from typing import Dict, Tuple, Type, Optional
 
-@dataclass
+# Decoded instructions are plain __slots__ classes: one is built for every instruction word
+# shown, so they skip the per-instance __dict__ and the dataclass __init__/__post_init__ chain.
+# Immediates are sign-extended as (raw ^ sign_bit) - sign_bit, which needs no branch.
+
 class BaseInstruction:
     """Base class for all RISC-V instructions with disassembly support."""
-    word: int
-    opcode: int = field(init=False)
-    mnemonic: str = "unknown"
+    __slots__ = ("word", "opcode", "mnemonic")
+
+    def __init__(self, word: int, mnemonic: str = "unknown"):
+        self.word = word
+        self.opcode = word & 0b1111111
+        self.mnemonic = mnemonic
 
-    def __post_init__(self):
-        self.opcode = self.word & 0b1111111
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        # Every field is derived from the word
+        return self.word == other.word and self.mnemonic == other.mnemonic
+
+    __hash__ = None
 
     def __repr__(self) -> str:
         """Default fallback representation."""
         return f"{self.mnemonic} (raw: {hex(self.word)})"
 
-@dataclass
 class RType(BaseInstruction):
-    rd: int = field(init=False); funct3: int = field(init=False)
-    rs1: int = field(init=False); rs2: int = field(init=False)
-    funct7: int = field(init=False)
-
-    def __post_init__(self):
-        super().__post_init__()
-        self.rd     = (self.word >> 7)  & 0x1F
-        self.funct3 = (self.word >> 12) & 0x07
-        self.rs1    = (self.word >> 15) & 0x1F
-        self.rs2    = (self.word >> 20) & 0x1F
-        self.funct7 = (self.word >> 25) & 0x7F
+    __slots__ = ("rd", "funct3", "rs1", "rs2", "funct7")
+
+    def __init__(self, word: int, mnemonic: str = "unknown"):
+        super().__init__(word, mnemonic)
+        self.rd     = (word >> 7)  & 0x1F
+        self.funct3 = (word >> 12) & 0x07
+        self.rs1    = (word >> 15) & 0x1F
+        self.rs2    = (word >> 20) & 0x1F
+        self.funct7 = (word >> 25) & 0x7F
 
     def __repr__(self) -> str:
         return f"{self.mnemonic:7} x{self.rd}, x{self.rs1}, x{self.rs2}"
 
-@dataclass
 class SystemType(BaseInstruction):
     """Refined SystemType to support field-based lookup."""
-    funct3: int = field(init=False)
-    funct7: int = field(init=False)
+    __slots__ = ("funct3", "funct7")
 
-    def __post_init__(self):
-        super().__post_init__()
-        self.funct3 = (self.word >> 12) & 0x07
-        self.funct7 = (self.word >> 25) & 0x7F
+    def __init__(self, word: int, mnemonic: str = "unknown"):
+        super().__init__(word, mnemonic)
+        self.funct3 = (word >> 12) & 0x07
+        self.funct7 = (word >> 25) & 0x7F
 
     def __repr__(self) -> str:
         return f"{self.mnemonic}"
 
-@dataclass
 class IType(BaseInstruction):
-    rd: int = field(init=False); funct3: int = field(init=False)
-    rs1: int = field(init=False); imm: int = field(init=False)
+    __slots__ = ("rd", "funct3", "rs1", "imm")
 
-    def __post_init__(self):
-        super().__post_init__()
-        self.rd     = (self.word >> 7)  & 0x1F
-        self.funct3 = (self.word >> 12) & 0x07
-        self.rs1    = (self.word >> 15) & 0x1F
-        raw_imm     = (self.word >> 20) & 0xFFF
-        self.imm    = raw_imm if raw_imm < 0x800 else raw_imm - 0x1000
+    def __init__(self, word: int, mnemonic: str = "unknown"):
+        super().__init__(word, mnemonic)
+        self.rd     = (word >> 7)  & 0x1F
+        self.funct3 = (word >> 12) & 0x07
+        self.rs1    = (word >> 15) & 0x1F
+        raw_imm     = (word >> 20) & 0xFFF
+        self.imm    = (raw_imm ^ 0x800) - 0x800
 
     def __repr__(self) -> str:
-        # Shifts (slli, srli, srai) use only the lower 5 bits of the immediate
-        if self.opcode == 0b0010011 and self.funct3 in [0b001, 0b101]:
-            shamt = self.word >> 20 & 0x1F
-            return f"{self.mnemonic:7} x{self.rd}, x{self.rs1}, {shamt}"
-        # Loads
-        if self.opcode == 0b0000011:
-            return f"{self.mnemonic:7} x{self.rd}, {self.imm}(x{self.rs1})"
-        # JALR
-        if self.opcode == 0b1100111:
-            return f"jalr    x{self.rd}, x{self.rs1}, {self.imm}"
-        # Standard arithmetic
-        return f"{self.mnemonic:7} x{self.rd}, x{self.rs1}, {self.imm}"
-
-@dataclass
+        # The operand layout depends only on opcode and funct3, so it is picked from a table
+        return _ITYPE_REPR.get(self.opcode | (self.funct3 << 7), _repr_i_arith)(self)
+
+# Shifts (slli, srli, srai) use only the lower 5 bits of the immediate
+def _repr_i_shift(i: IType) -> str:
+    return f"{i.mnemonic:7} x{i.rd}, x{i.rs1}, {i.word >> 20 & 0x1F}"
+
+# Loads
+def _repr_i_load(i: IType) -> str:
+    return f"{i.mnemonic:7} x{i.rd}, {i.imm}(x{i.rs1})"
+
+# JALR
+def _repr_i_jalr(i: IType) -> str:
+    return f"jalr    x{i.rd}, x{i.rs1}, {i.imm}"
+
+# Standard arithmetic
+def _repr_i_arith(i: IType) -> str:
+    return f"{i.mnemonic:7} x{i.rd}, x{i.rs1}, {i.imm}"
+
+# opcode | funct3 << 7 -> IType disassembly layout; anything else is standard arithmetic
+_ITYPE_REPR = {
+    **{0b0000011 | (f3 << 7): _repr_i_load for f3 in range(8)},
+    **{0b1100111 | (f3 << 7): _repr_i_jalr for f3 in range(8)},
+    0b0010011 | (0b001 << 7): _repr_i_shift,
+    0b0010011 | (0b101 << 7): _repr_i_shift,
+}
+
 class SType(BaseInstruction):
-    funct3: int = field(init=False); rs1: int = field(init=False)
-    rs2: int = field(init=False); imm: int = field(init=False)
-
-    def __post_init__(self):
-        super().__post_init__()
-        self.funct3 = (self.word >> 12) & 0x07
-        self.rs1    = (self.word >> 15) & 0x1F
-        self.rs2    = (self.word >> 20) & 0x1F
-        imm_4_0     = (self.word >> 7)  & 0x1F
-        imm_11_5    = (self.word >> 25) & 0x7F
+    __slots__ = ("funct3", "rs1", "rs2", "imm")
+
+    def __init__(self, word: int, mnemonic: str = "unknown"):
+        super().__init__(word, mnemonic)
+        self.funct3 = (word >> 12) & 0x07
+        self.rs1    = (word >> 15) & 0x1F
+        self.rs2    = (word >> 20) & 0x1F
+        imm_4_0     = (word >> 7)  & 0x1F
+        imm_11_5    = (word >> 25) & 0x7F
         raw_imm     = (imm_11_5 << 5) | imm_4_0
-        self.imm    = raw_imm if raw_imm < 0x800 else raw_imm - 0x1000
+        self.imm    = (raw_imm ^ 0x800) - 0x800
 
     def __repr__(self) -> str:
         return f"{self.mnemonic:7} x{self.rs2}, {self.imm}(x{self.rs1})"
 
-@dataclass
 class BType(BaseInstruction):
-    funct3: int = field(init=False); rs1: int = field(init=False)
-    rs2: int = field(init=False); imm: int = field(init=False)
-
-    def __post_init__(self):
-        super().__post_init__()
-        self.funct3 = (self.word >> 12) & 0x07
-        self.rs1    = (self.word >> 15) & 0x1F
-        self.rs2    = (self.word >> 20) & 0x1F
-        imm_11      = (self.word >> 7)  & 0x1
-        imm_4_1     = (self.word >> 8)  & 0xF
-        imm_10_5    = (self.word >> 25) & 0x3F
-        imm_12      = (self.word >> 31) & 0x1
+    __slots__ = ("funct3", "rs1", "rs2", "imm")
+
+    def __init__(self, word: int, mnemonic: str = "unknown"):
+        super().__init__(word, mnemonic)
+        self.funct3 = (word >> 12) & 0x07
+        self.rs1    = (word >> 15) & 0x1F
+        self.rs2    = (word >> 20) & 0x1F
+        imm_11      = (word >> 7)  & 0x1
+        imm_4_1     = (word >> 8)  & 0xF
+        imm_10_5    = (word >> 25) & 0x3F
+        imm_12      = (word >> 31) & 0x1
         raw_imm     = (imm_12 << 12) | (imm_11 << 11) | (imm_10_5 << 5) | (imm_4_1 << 1)
-        self.imm    = raw_imm if raw_imm < 0x1000 else raw_imm - 0x2000
+        self.imm    = (raw_imm ^ 0x1000) - 0x1000
 
     def __repr__(self) -> str:
         return f"{self.mnemonic:7} x{self.rs1}, x{self.rs2}, {self.imm}"
 
-@dataclass
 class UType(BaseInstruction):
-    rd: int = field(init=False); imm: int = field(init=False)
+    __slots__ = ("rd", "imm")
 
-    def __post_init__(self):
-        super().__post_init__()
-        self.rd  = (self.word >> 7) & 0x1F
-        self.imm = self.word & 0xFFFFF000
+    def __init__(self, word: int, mnemonic: str = "unknown"):
+        super().__init__(word, mnemonic)
+        self.rd  = (word >> 7) & 0x1F
+        self.imm = word & 0xFFFFF000
 
     def __repr__(self) -> str:
         return f"{self.mnemonic:7} x{self.rd}, {hex(self.imm)}"
 
-@dataclass
 class JType(BaseInstruction):
-    rd: int = field(init=False); imm: int = field(init=False)
-
-    def __post_init__(self):
-        super().__post_init__()
-        self.rd = (self.word >> 7) & 0x1F
-        imm_19_12 = (self.word >> 12) & 0xFF
-        imm_11    = (self.word >> 20) & 0x1
-        imm_10_1  = (self.word >> 21) & 0x3FF
-        imm_20    = (self.word >> 31) & 0x1
+    __slots__ = ("rd", "imm")
+
+    def __init__(self, word: int, mnemonic: str = "unknown"):
+        super().__init__(word, mnemonic)
+        self.rd = (word >> 7) & 0x1F
+        imm_19_12 = (word >> 12) & 0xFF
+        imm_11    = (word >> 20) & 0x1
+        imm_10_1  = (word >> 21) & 0x3FF
+        imm_20    = (word >> 31) & 0x1
         raw_imm = (imm_20 << 20) | (imm_19_12 << 12) | (imm_11 << 11) | (imm_10_1 << 1)
-        self.imm = raw_imm if raw_imm < 0x100000 else raw_imm - 0x200000
+        self.imm = (raw_imm ^ 0x100000) - 0x100000
 
     def __repr__(self) -> str:
         return f"{self.mnemonic:7} x{self.rd}, {self.imm}"
 
 
+def _flatten_mnemonics(mnemonic_map: Dict[Tuple[int, Optional[int], Optional[int]], str]) -> Dict[int, str]:
+    """
+    Expands every (opcode, funct3, funct7) entry, None meaning "any", into all the packed
+    opcode | funct3 << 7 | funct7 << 10 keys it covers, so decoding needs no fallback probes.
+    More specific entries are written last and win, which keeps the lookup order
+    (opcode, f3, f7) -> (opcode, f3, None) -> (opcode, None, None).
+    """
+    flat = {}
+    for specificity in range(3):
+        for (opcode, f3, f7), mnemonic in mnemonic_map.items():
+            if (f3 is not None) + (f7 is not None) != specificity:
+                continue
+            for funct3 in (range(8) if f3 is None else (f3,)):
+                for funct7 in (range(128) if f7 is None else (f7,)):
+                    flat[opcode | (funct3 << 7) | (funct7 << 10)] = mnemonic
+    return flat
+
+
 class InstructionFactory:
     # --- OPCODES (Bits 6:0) ---
     OP_R_TYPE   = 0b0110011  # Arithmetic Register-Register
@@ -217,30 +246,18 @@ class InstructionFactory:
         (OP_SYSTEM, 0b000, 0b0000000): "ecall",
     }
 
+    # MNEMONIC_MAP flattened to opcode | funct3 << 7 | funct7 << 10 -> mnemonic
+    MNEMONIC_FLAT: Dict[int, str] = _flatten_mnemonics(MNEMONIC_MAP)
+
     @classmethod
     def decode(cls, word: int) -> BaseInstruction:
         opcode = word & 0b1111111
         
-        # 1. Instantiate the correct Format DTO
-        dto_class = cls.FORMAT_MAP.get(opcode, BaseInstruction)
-        instr = dto_class(word)
+        # 1. Look up the mnemonic: one dict hit on the packed opcode/funct3/funct7 bits
+        mnemonic = cls.MNEMONIC_FLAT.get(opcode | ((word >> 5) & 0x380) | ((word >> 15) & 0x1FC00), "unknown")
 
-        # 2. Extract functional fields
-        f3 = getattr(instr, 'funct3', None)
-        
-        # For R-Type AND I-Type shifts, we need bits [31:25] (funct7)
-        # Shift instructions (slli, srli, srai) have opcode 0b0010011
-        f7 = None
-        if opcode in [cls.OP_R_TYPE, cls.OP_I_TYPE, cls.OP_SYSTEM]:
-            f7 = (word >> 25) & 0x7F
-
-
-        for key in [(opcode, f3, f7), (opcode, f3, None), (opcode, None, None)]:
-                    if key in cls.MNEMONIC_MAP:
-                        instr.mnemonic = cls.MNEMONIC_MAP[key]
-                        break
-                
-        return instr
+        # 2. Instantiate the correct Format DTO
+        return cls.FORMAT_MAP.get(opcode, BaseInstruction)(word, mnemonic)
 
 
 if __name__ == "__main__":
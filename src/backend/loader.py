@@ -18,6 +18,7 @@ CMD_LOAD_DATA = 0x1D
 ACK_FINISH    = 0xF1
 ECALL_OPCODE  = b'\x73\x00\x00\x00'
 MAX_WORDS     = 256  # Your specific hardware limit
+WRITE_CHUNK   = 4096 # Bytes handed to the serial driver per write() call
 
 # Connect to the UI logger
 clean_out = logging.getLogger('riscv.clean')
@@ -51,7 +52,7 @@ def validate_payload(data: bytearray, is_instruction: bool):
         else:            
             clean_out.info("- ✅ ECALL check passed: Last instruction is ECALL.")
 
-    return data
+    return bytes(data)
 
 def upload_to_fpga(payload: bytes, is_instruction: bool):
     """
@@ -88,18 +89,20 @@ def upload_to_fpga(payload: bytes, is_instruction: bool):
             # 2. Send Word Count (Big Endian as per your protocol)
             size_bytes = struct.pack('>H', word_count)
             clean_out.info(f"Sending Word Count: {word_count}")
-            ser.write(size_bytes)
             raw_out.info(f">> {size_bytes.hex().upper()}")
 
-            # 3. Send Payload
+            # 3. Send Payload (the FPGA does not ACK the size, so it rides in the same stream)
             clean_out.info(f"Transmitting {len(data)} bytes...")
-            ser.write(data)
+            view = memoryview(size_bytes + data)
+            for i in range(0, len(view), WRITE_CHUNK):
+                ser.write(view[i:i+WRITE_CHUNK])
+            ser.flush()
             
-            # Log payload in 64-byte chunks with hex formatting
-            for i in range(0, len(data), 64):
-                chunk = data[i:i+64]
-                hex_str = ' '.join(f'{byte:02X}' for byte in chunk)
-                raw_out.info(f">> {hex_str}")
+            # Log payload in 64-byte rows with hex formatting, as one record for the whole payload
+            if raw_out.isEnabledFor(logging.INFO):
+                raw_out.info("\n".join(
+                    f">> {data[i:i+64].hex(' ').upper()}" for i in range(0, len(data), 64)
+                ))
 
             # 4. Final ACK
             ack = ser.read(1)
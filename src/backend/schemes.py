@@ -2,10 +2,13 @@ from __future__ import annotations
 from backend.instructions import BaseInstruction, InstructionFactory
 from dataclasses import dataclass
 from typing import List, Tuple, Iterable
+from functools import lru_cache
 import struct
+from array import array
 from enum import Enum
 
 WORD_SIZE_BYTES = 4 # 32 bits
+PIPELINE_WORD_COUNT = 32 + 1 + 3 + 6 + 4 + 4 # Register file + Hazard + IF/ID + ID/EX + EX/MEM + MEM/WB
 
 
 def extract_bits(word: int, shift: int, width: int) -> int:
@@ -16,15 +19,24 @@ def extract_bits(word: int, shift: int, width: int) -> int:
     return (word >> shift) & mask
 
 class Flag:
+    __slots__ = ("name", "value")
+
     def __init__(self, name: str, value:  bool):
-        self.name = name
-        self.value = value
+        # Decoded flags are shared through the hazard LUT and the memoized control decoders,
+        # so they are immutable once built
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "value", value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Flag is immutable; cannot set '{name}'")
 
     def __str__(self):
         return f"{self.name}: YES" if self.value else f"{self.name}: NO"
 
 
 class ProgramCounter:
+    __slots__ = ("value",)
+
     def __init__(self, value: int):
         self.value = value
 
@@ -33,6 +45,8 @@ class ProgramCounter:
 
 
 class RegisterFileEntry:
+    __slots__ = ("reg_addr", "value")
+
     def __init__(self, reg_addr: int, value: int):
         self.reg_addr = reg_addr
         self.value = value
@@ -41,11 +55,18 @@ class RegisterFileEntry:
         return f"x{self.reg_addr}: 0x{self.value:08X}"
     
 class RegisterFile:
+    __slots__ = ("entries", "values")
+
     def __init__(self, entries: Iterable[RegisterFileEntry]):
         self.entries = list(entries)
+        # Packed uint32 copy of the register values, cheap to compare and scan between snapshots
+        self.values = array('I', [entry.value for entry in self.entries])
+
+    _ROW_FORMAT = "x{}: 0x{:08X}" # Same layout as RegisterFileEntry.__str__
 
     def __str__(self):
-        return "\n".join(str(entry) for entry in self.entries)
+        row = self._ROW_FORMAT.format
+        return "\n".join([row(reg_addr, value) for reg_addr, value in enumerate(self.values)])
     
 
 class MemoryDumpMode(Enum):
@@ -196,7 +217,7 @@ class InUseRegisterType(Enum):
         else:
             return "UNKNOWN"
         
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class InUseRegisterAddress:
     type: InUseRegisterType
     reg_addr: int  # 0..31
@@ -208,7 +229,7 @@ class InUseRegisterAddress:
 
 
 # Hazard status for the whole system
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class HazardStatus:
 
     pc_write_en: Flag
@@ -221,6 +242,11 @@ class HazardStatus:
 
     @staticmethod
     def unpack(word: int) -> "HazardStatus":
+        # Only bits 11..4 and 0 carry information: 512 possible states, all prebuilt below
+        return _HAZARD_STATUS_LUT[(extract_bits(word, 4, 8) << 1) | (word & 1)]
+
+    @staticmethod
+    def decode(word: int) -> "HazardStatus":
         return HazardStatus(
             pc_write_en=Flag("PC Write Enable",extract_bits(word, 11, 1)),
             if_id_write_en=Flag("IF/ID Write Enable",extract_bits(word, 10, 1)),
@@ -251,7 +277,12 @@ class HazardStatus:
                 f"RS2 Data Source: {self.rs2_data_source}\n"
                 f"{self.program_ended}")
 
-@dataclass(frozen=True)
+# Indexed by (bits 11..4 << 1) | bit 0 of the hazard word
+_HAZARD_STATUS_LUT = tuple(
+    HazardStatus.decode(((index >> 1) << 4) | (index & 1)) for index in range(512)
+)
+
+@dataclass(frozen=True, slots=True)
 class IF_ID_Status:
     incremented_program_counter_if: ProgramCounter
     instruction_if: BaseInstruction
@@ -277,7 +308,7 @@ class IF_ID_Status:
                 f"Instruction @ IF: {self.instruction_if}\n"
                 f"Incremented PC @ IF: {self.incremented_program_counter_if}")
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ID_EX_Status:
     reg_write_id: Flag
     mem_write_id: Flag
@@ -302,21 +333,39 @@ class ID_EX_Status:
     funct3_id: int
     funct7_id: int
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def decode_controls(control_word: int) -> tuple:
+        """Decoded ID/EX control signals. Only a handful of control words ever occur, so they are memoized."""
+        return (
+            Flag("is_halt @ ID", extract_bits(control_word, 0, 1)),
+            Flag("is_jalr @ ID", extract_bits(control_word, 1, 1)),
+            Flag("is_jal @ ID", extract_bits(control_word, 2, 1)),
+            Flag("is_branch @ ID", extract_bits(control_word, 3, 1)),
+            RD_Source(extract_bits(control_word, 4, 1)),
+            AluIntent(extract_bits(control_word, 5, 2)),
+            Alu_Src_Optn(extract_bits(control_word, 7, 1)),
+            Flag("mem_read @ ID", extract_bits(control_word, 8, 1)),
+            Flag("mem_write @ ID", extract_bits(control_word, 9, 1)),
+            Flag("reg_write @ ID", extract_bits(control_word, 10, 1)),
+        )
+
     @staticmethod
     def unpack(words: List[int]) -> "ID_EX_Status":
-        control_word = words[0]
+        (is_halt, is_jalr, is_jal, is_branch, rd_src, alu_intent,
+         alu_src_optn, mem_read, mem_write, reg_write) = ID_EX_Status.decode_controls(words[0] & 0x7FF)
         metadata_word = words[5]
         return ID_EX_Status(
-            is_halt_id=Flag("is_halt @ ID", extract_bits(control_word, 0, 1)),
-            is_jalr_id=Flag("is_jalr @ ID", extract_bits(control_word, 1, 1)),
-            is_jal_id=Flag("is_jal @ ID", extract_bits(control_word, 2, 1)),
-            is_branch_id=Flag("is_branch @ ID", extract_bits(control_word, 3, 1)),
-            rd_src_id=RD_Source(extract_bits(control_word, 4, 1)),
-            alu_intent_id=AluIntent(extract_bits(control_word, 5, 2)),
-            alu_src_optn_id=Alu_Src_Optn(extract_bits(control_word, 7, 1)),
-            mem_read_id=Flag("mem_read @ ID", extract_bits(control_word, 8, 1)),
-            mem_write_id=Flag("mem_write @ ID", extract_bits(control_word, 9, 1)),
-            reg_write_id=Flag("reg_write @ ID", extract_bits(control_word, 10, 1)),
+            is_halt_id=is_halt,
+            is_jalr_id=is_jalr,
+            is_jal_id=is_jal,
+            is_branch_id=is_branch,
+            rd_src_id=rd_src,
+            alu_intent_id=alu_intent,
+            alu_src_optn_id=alu_src_optn,
+            mem_read_id=mem_read,
+            mem_write_id=mem_write,
+            reg_write_id=reg_write,
             pc_id=ProgramCounter(words[1]),
             rs1_data_id=words[2],
             rs2_data_id=words[3],
@@ -350,7 +399,7 @@ class ID_EX_Status:
                 f"Reg Write @ ID: {self.reg_write_id}")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EX_MEM_Status:
     reg_write_ex: Flag
     mem_write_ex: Flag
@@ -365,17 +414,31 @@ class EX_MEM_Status:
     funct3_ex: int
 
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def decode_controls(control_word: int) -> tuple:
+        """Decoded EX/MEM control and metadata fields, memoized per control word."""
+        return (
+            extract_bits(control_word, 0, 3),
+            InUseRegisterAddress(reg_addr=extract_bits(control_word, 3, 5), type=InUseRegisterType.RD),
+            Flag("is_halt @ EX",extract_bits(control_word, 8, 1)),
+            RD_Source(extract_bits(control_word, 9, 1)),
+            Flag("mem_read @ EX",extract_bits(control_word, 10, 1)),
+            Flag("mem_write @ EX",extract_bits(control_word, 11, 1)),
+            Flag("reg_write @ EX",extract_bits(control_word, 12, 1)),
+        )
+
     @staticmethod
     def unpack(words: List[int]) -> "EX_MEM_Status":
-        control_word = words[0]
+        funct3, rd, is_halt, rd_src, mem_read, mem_write, reg_write = EX_MEM_Status.decode_controls(words[0] & 0x1FFF)
         return EX_MEM_Status(
-            funct3_ex=extract_bits(control_word, 0, 3),
-            rd_ex=InUseRegisterAddress(reg_addr=extract_bits(control_word, 3, 5), type=InUseRegisterType.RD),
-            is_halt_ex=Flag("is_halt @ EX",extract_bits(control_word, 8, 1)),
-            rd_src_ex=RD_Source(extract_bits(control_word, 9, 1)),
-            mem_read_ex=Flag("mem_read @ EX",extract_bits(control_word, 10, 1)),
-            mem_write_ex=Flag("mem_write @ EX",extract_bits(control_word, 11, 1)),
-            reg_write_ex=Flag("reg_write @ EX",extract_bits(control_word, 12, 1)),
+            funct3_ex=funct3,
+            rd_ex=rd,
+            is_halt_ex=is_halt,
+            rd_src_ex=rd_src,
+            mem_read_ex=mem_read,
+            mem_write_ex=mem_write,
+            reg_write_ex=reg_write,
             pc_ex=ProgramCounter(words[1]),
             store_data_ex=words[2],
             alu_result_ex=words[3]
@@ -393,7 +456,7 @@ class EX_MEM_Status:
                 f"Mem Write @ EX: {self.mem_write_ex}\n"
                 f"Reg Write @ EX: {self.reg_write_ex}")
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MEM_WB_Status:
     reg_write_mem: Flag
     rd_src_mem: RD_Source
@@ -404,14 +467,25 @@ class MEM_WB_Status:
     pc_mem: ProgramCounter
     rd_mem: InUseRegisterAddress
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def decode_controls(control_word: int) -> tuple:
+        """Decoded MEM/WB control and metadata fields, memoized per control word."""
+        return (
+            InUseRegisterAddress(reg_addr=extract_bits(control_word, 0, 5), type=InUseRegisterType.RD),
+            Flag("is_halt @ MEM",extract_bits(control_word, 5, 1)),
+            RD_Source(extract_bits(control_word, 6, 1)),
+            Flag("reg_write @ MEM",extract_bits(control_word, 7, 1)),
+        )
+
     @staticmethod
     def unpack(words: List[int]) -> "MEM_WB_Status":
-        control_word = words[0]
+        rd, is_halt, rd_src, reg_write = MEM_WB_Status.decode_controls(words[0] & 0xFF)
         return MEM_WB_Status(
-            rd_mem=InUseRegisterAddress(reg_addr=extract_bits(control_word, 0, 5), type=InUseRegisterType.RD),
-            is_halt_mem=Flag("is_halt @ MEM",extract_bits(control_word, 5, 1)),
-            rd_src_mem=RD_Source(extract_bits(control_word, 6, 1)),
-            reg_write_mem=Flag("reg_write @ MEM",extract_bits(control_word, 7, 1)),
+            rd_mem=rd,
+            is_halt_mem=is_halt,
+            rd_src_mem=rd_src,
+            reg_write_mem=reg_write,
             pc_mem=ProgramCounter(words[1]),
             execution_data_mem=words[2],
             memory_data_mem=words[3]    
@@ -426,7 +500,7 @@ class MEM_WB_Status:
                 f"RD Source @ MEM: {self.rd_src_mem}\n"
                 f"Reg Write @ MEM: {self.reg_write_mem}")
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AtomicMemTransaction:
     """Single store transaction (diff mode)."""
     occurred: bool
@@ -451,7 +525,7 @@ class AtomicMemTransaction:
             return "No store"
         return f"{self.type} @ 0x{self.address:08X} <= 0x{self.data:08X}"
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MemPatch:
     """Range-based memory patch (range mode)."""
     min_address: int
@@ -481,7 +555,7 @@ class MemPatch:
 
         return f"MemPatch from 0x{self.min_address:08X} to 0x{self.max_address:08X}:\n{content_str}"
 
-@dataclass(frozen=True)       
+@dataclass(frozen=True, slots=True)
 class PipelineStatus:
     memory_dump_mode: MemoryDumpMode
     register_file: RegisterFile
@@ -494,30 +568,25 @@ class PipelineStatus:
     @staticmethod
     def unpack(memory_dump_mode, words: List[int]) -> "PipelineStatus":
         # Check words length
-        expected_length = 32 + 1 + 3 + 6 + 4 + 4  # Register file + Hazard + IF/ID + ID/EX + EX/MEM + MEM/WB
-        if len(words) != expected_length:
-            raise ValueError(f"Expected {expected_length} words, got {len(words)}")
+        if len(words) != PIPELINE_WORD_COUNT:
+            raise ValueError(f"Expected {PIPELINE_WORD_COUNT} words, got {len(words)}")
         
-        # Unpack Register File
-        register_file_entries = []
-        for i in range(32):
-            reg_addr = i
-            value = words[i]
-            register_file_entries.append(RegisterFileEntry(reg_addr, value))
-        
-        detected_register_file = RegisterFile(register_file_entries)
-        
-        # Reset words index after register file
-        words = words[32:]
+        # Unpack Register File (the 32 words were already decoded in one struct call)
+        detected_register_file = RegisterFile(
+            RegisterFileEntry(reg_addr, value) for reg_addr, value in enumerate(words[:32])
+        )
         
+        # Pipeline words start right after the register file; index from there instead of copying the tail
+        base = 32
+
         return PipelineStatus(
             memory_dump_mode=memory_dump_mode,
             register_file= detected_register_file,
-            hazard_status=HazardStatus.unpack(words[0]),
-            if_id_status=IF_ID_Status.unpack(words[1:4]),
-            id_ex_status=ID_EX_Status.unpack(words[4:10]),
-            ex_mem_status=EX_MEM_Status.unpack(words[10:14]),
-            mem_wb_status=MEM_WB_Status.unpack(words[14:18]),
+            hazard_status=HazardStatus.unpack(words[base]),
+            if_id_status=IF_ID_Status.unpack(words[base + 1:base + 4]),
+            id_ex_status=ID_EX_Status.unpack(words[base + 4:base + 10]),
+            ex_mem_status=EX_MEM_Status.unpack(words[base + 10:base + 14]),
+            mem_wb_status=MEM_WB_Status.unpack(words[base + 14:base + 18]),
         )
 
 
@@ -527,8 +596,15 @@ def unpack_words(data: bytes, word_amount: int, use_little_endian: bool = True)
     """Unpack N 32-bit words from bytes. Uses little endian as default"""
     if len(data) < word_amount * WORD_SIZE_BYTES:
         raise ValueError(f"Not enough data to unpack the required number of words. Expected at least {word_amount * WORD_SIZE_BYTES} bytes, got {len(data)} bytes.")
+    return list(_word_struct(word_amount, use_little_endian).unpack_from(data))
+
+
+# Packet layouts use a handful of word counts; the bound keeps arbitrary sizes from piling up
+@lru_cache(maxsize=64)
+def _word_struct(word_amount: int, use_little_endian: bool) -> struct.Struct:
+    """Compiled layout for N 32-bit words, so the format string is parsed only once per size."""
     endian_char = "<" if use_little_endian else ">"
-    return list(struct.unpack(f"{endian_char}{word_amount}I", data[: word_amount * WORD_SIZE_BYTES]))
+    return struct.Struct(f"{endian_char}{word_amount}I")
 
 
 # -----------------------------
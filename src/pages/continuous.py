@@ -2,6 +2,7 @@ from nicegui import ui, run
 from state import app_state, cont_exec_result, data_state
 from backend.executor import execute_program
 from typing import List, Set, Tuple
+from dataclasses import fields
 from backend.schemes import MemPatch
 import logging
 
@@ -122,10 +123,10 @@ def main_window():
                             with ui.expansion(title, icon='settings_input_component').classes('w-full bg-slate-800 mb-2 text-white border border-slate-700 text-2xl').props('default-opened'):
                                 with ui.column().classes('w-full p-4 gap-1'):
                                     # Iterate over fields in the dataclass
-                                    for field_name, field_value in data_obj.__dict__.items():
+                                    for data_field in fields(data_obj):
                                         # Clean up field name (e.g., 'pc_write_en' -> 'Pc Write En')
-                                        clean_name = field_name.replace('_', ' ').title()
-                                        ui_kv_row(clean_name, field_value)
+                                        clean_name = data_field.name.replace('_', ' ').title()
+                                        ui_kv_row(clean_name, getattr(data_obj, data_field.name))
 
                         # Render Sections
                         pipeline_section("Hazards Status", status.hazard_status)
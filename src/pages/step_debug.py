@@ -2,7 +2,7 @@ import json
 import os
 import re
 from nicegui import ui, run, events
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import List, Tuple, Optional
 from state import step_by_step_state as step_state
 from state import data_state, app_state
@@ -109,9 +109,10 @@ def register_grid():
 
 @ui.refreshable
 def memory_list():
-    # Transform the memory list into the format AG Grid expects
+    # Transform the memory list into the format AG Grid expects. The rows are built right away,
+    # so a read-only view is enough and the memory dict is not copied on every refresh
     rows = []
-    for addr, val in cpu_model.data_memory.get_memory_snapshot().items():
+    for addr, val in cpu_model.data_memory.get_memory_view().items():
         rows.append({
             'address': f"0x{addr:08X}", 
             'data': f"0x{val:08X}"  # Formatted as 32-bit hex
@@ -147,9 +148,9 @@ def pipeline_info():
         with expansion:
             with ui.column().classes('w-full p-4 gap-1'):
                 # Iterate over dataclass fields and clean up names
-                for field_name, field_value in data_obj.__dict__.items():
-                    clean_name = field_name.replace('_', ' ').title()
-                    ui_kv_row(clean_name, field_value)
+                for data_field in fields(data_obj):
+                    clean_name = data_field.name.replace('_', ' ').title()
+                    ui_kv_row(clean_name, getattr(data_obj, data_field.name))
 
     # Recreate the pipeline hierarchy
     pipeline_section("Hazards Status", status.hazard_status)